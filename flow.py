@@ -1,7 +1,7 @@
-from pocketflow import Flow
+from pocketflow import Flow, AsyncFlow
 from nodes import (
     GetQuestionNode, AnswerNode,  # Legacy nodes
-    InitializeNode, FetchStarredReposNode, ModeDecisionNode,
+    InitializeNode, ModeDecisionNode,
     AnalyzeRepositoriesNode, ManageStarListsNode
 )
 
@@ -21,20 +21,16 @@ def create_star_classification_flow():
     """Create and return the main star classification flow."""
     # Create all nodes
     initialize_node = InitializeNode()
-    fetch_repos_node = FetchStarredReposNode()
     mode_decision_node = ModeDecisionNode()
     analyze_repos_node = AnalyzeRepositoriesNode()
     manage_lists_node = ManageStarListsNode()
     
-    # Connect nodes in sequence
-    initialize_node >> fetch_repos_node
-    fetch_repos_node >> mode_decision_node
+    # Connect nodes in sequence; starred repos are fetched while they are
+    # analyzed, so the mode (and existing categories) is decided first
+    initialize_node >> mode_decision_node
     mode_decision_node >> analyze_repos_node
     analyze_repos_node >> manage_lists_node
     
-    # Create flow starting with initialization
-    return Flow(start=initialize_node)
-
-# Default flows
-qa_flow = create_qa_flow()
-star_flow = create_star_classification_flow()
\ No newline at end of file
+    # Create flow starting with initialization; async because repository
+    # fetching and analysis run concurrently
+    return AsyncFlow(start=initialize_node)
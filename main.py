@@ -1,28 +1,73 @@
+import asyncio
 import logging
+import logging.handlers
 import sys
-import os
 import click
-from flow import create_qa_flow, create_star_classification_flow
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 
 def setup_logging(level=logging.INFO):
     """Setup logging configuration"""
+    # Buffer log file writes; errors flush immediately and logging's exit
+    # hook flushes whatever is left when the process ends
+    file_handler = logging.FileHandler('star-tidy.log')
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
     logging.basicConfig(
         level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
+        format=LOG_FORMAT,
         handlers=[
             logging.StreamHandler(sys.stdout),
-            logging.FileHandler('star-tidy.log')
+            buffered_file_handler
         ]
     )
 
-def main_star_classification():
-    """Main star classification functionality"""
-    shared = {}
+def run_async(coro):
+    """Run a coroutine on a fresh event loop
+    
+    On Python 3.12+ the loop uses the eager task factory, so coroutines that
+    finish without suspending (e.g. cached analyses) skip task scheduling.
+    """
+    if sys.version_info < (3, 12):
+        return asyncio.run(coro)
+    
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+def main_star_classification(run_config=None, on_progress=None):
+    """Main star classification functionality
+    
+    Args:
+        run_config: Optional RunConfig with per-run overrides (e.g. CLI flags)
+        on_progress: Optional callback receiving (analyzed, total) as
+            repositories are classified
+    """
+    # Imported lazily: the flow pulls in pocketflow, openai and the utils,
+    # which commands like --version, config and setup don't need
+    from flow import create_star_classification_flow
+    
+    shared = {"run_config": run_config, "on_progress": on_progress}
     
     try:
         # Create and run star classification flow
         star_flow = create_star_classification_flow()
-        star_flow.run(shared)
+        run_async(star_flow.run_async(shared))
         
         # Output final results
         if "operation_results" in shared:
@@ -55,9 +100,15 @@ def main_star_classification():
         logging.error(f"Star classification failed: {e}")
         print(f"Error: {e}")
         return False
+    finally:
+        # Release the GitHub client's pooled connections
+        if shared.get("github_client"):
+            shared["github_client"].close()
 
 def main_qa():
     """Legacy Q&A functionality"""
+    from flow import create_qa_flow
+    
     shared = {
         "question": "In one sentence, what's the end of universe?",
         "answer": None
@@ -94,8 +145,8 @@ def cli(ctx, verbose, version):
 @cli.command()
 @click.option("--mode", 
               type=click.Choice(["auto", "existing_lists"]), 
-              default="auto",
-              help="Classification mode: 'auto' creates new lists, 'existing_lists' uses current lists")
+              default=None,
+              help="Classification mode: 'auto' creates new lists, 'existing_lists' uses current lists [default: auto]")
 @click.option("--dry-run", is_flag=True, help="Run in dry-run mode (no actual changes)")
 @click.option("--auto-complete-summaries/--no-auto-complete-summaries", 
               default=None,
@@ -109,6 +160,7 @@ def cli(ctx, verbose, version):
 @click.option("--include-stats/--no-include-stats",
               default=None,
               help="Include repository statistics in summaries")
+@click.option("--no-cache", is_flag=True, help="Disable the repository analysis cache")
 @click.option("--exclude-repo", 
               multiple=True,
               help="Exclude specific repositories (can be used multiple times)")
@@ -126,53 +178,48 @@ def cli(ctx, verbose, version):
               type=float,
               help="Sampling temperature (0-2)")
 def star(mode, dry_run, auto_complete_summaries, enhance_existing_summaries, 
-         use_ai_summary, include_stats, exclude_repo, config, ai_model, 
+         use_ai_summary, include_stats, no_cache, exclude_repo, config, ai_model, 
          api_base, max_tokens, temperature):
     """Run GitHub star classification"""
     
-    # Set environment variables from CLI options
-    if dry_run:
-        os.environ["DRY_RUN"] = "true"
-    
-    os.environ["STAR_TIDY_MODE"] = mode
+    # CLI options are passed to the flow explicitly rather than through
+    # os.environ, so they take priority over the config file and don't leak
+    # into later runs in the same process
+    from utils.config import RunConfig
     
-    # Set summary options if specified
-    if auto_complete_summaries is not None:
-        os.environ["AUTO_COMPLETE_SUMMARIES"] = str(auto_complete_summaries).lower()
-    if enhance_existing_summaries is not None:
-        os.environ["ENHANCE_EXISTING_SUMMARIES"] = str(enhance_existing_summaries).lower()
-    if use_ai_summary is not None:
-        os.environ["USE_AI_SUMMARY"] = str(use_ai_summary).lower()
-    if include_stats is not None:
-        os.environ["INCLUDE_STATS"] = str(include_stats).lower()
-    
-    # Set excluded repositories
-    if exclude_repo:
-        os.environ["EXCLUDE_REPOS"] = ",".join(exclude_repo)
-    
-    # Set config file path
-    if config:
-        os.environ["CONFIG_FILE"] = config
-    
-    # Set LLM options if specified
-    if ai_model:
-        os.environ["AI_MODEL"] = ai_model
-    if api_base:
-        os.environ["OPENAI_API_BASE"] = api_base
-    if max_tokens:
-        os.environ["MAX_TOKENS"] = str(max_tokens)
-    if temperature is not None:
-        os.environ["TEMPERATURE"] = str(temperature)
+    run_config = RunConfig(
+        config_file=config,
+        mode=mode,
+        dry_run=dry_run or None,
+        exclude_repos=tuple(exclude_repo) or None,
+        ai_model=ai_model,
+        openai_api_base=api_base,
+        max_tokens=max_tokens or None,
+        temperature=temperature,
+        use_cache=False if no_cache else None,
+        auto_complete_summaries=auto_complete_summaries,
+        enhance_existing_summaries=enhance_existing_summaries,
+        use_ai_summary=use_ai_summary,
+        include_stats=include_stats,
+    )
     
     # Display current settings
     click.echo(f"🚀 Starting star classification...")
-    click.echo(f"Mode: {mode}")
+    if mode:
+        click.echo(f"Mode: {mode}")
     if dry_run:
         click.echo("⚠️  DRY RUN mode - no actual changes will be made")
     
-    with click.progressbar(length=1, label="Running classification") as bar:
-        success = main_star_classification()
-        bar.update(1)
+    # Progress goes to stderr so redirected stdout only holds the report
+    with click.progressbar(length=0, label="Classifying repositories",
+                           show_pos=True, file=sys.stderr) as bar:
+        def on_progress(analyzed, total):
+            # The total grows while starred repos are still being fetched
+            bar.length = total
+            bar.finished = analyzed >= total
+            bar.update(analyzed - bar.pos)
+        
+        success = main_star_classification(run_config, on_progress)
     
     if success:
         click.echo("✅ Classification completed successfully!")
@@ -288,13 +335,14 @@ def test():
 def test_llm(api_key, api_base, model):
     """Test LLM connection and configuration"""
     from utils.call_llm import test_llm_connection, call_llm
+    from utils.config import get_env
     
     click.echo("🔮 Testing LLM connection...")
     
     # Show current configuration
-    actual_api_base = api_base or os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
-    actual_model = model or os.environ.get("AI_MODEL", "gpt-4o-mini")
-    actual_api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    actual_api_base = api_base or get_env("OPENAI_API_BASE", "https://api.openai.com/v1")
+    actual_model = model or get_env("AI_MODEL", "gpt-4o-mini")
+    actual_api_key = api_key or get_env("OPENAI_API_KEY")
     
     click.echo(f"API Base: {actual_api_base}")
     click.echo(f"Model: {actual_model}")
@@ -1,75 +1,85 @@
-from pocketflow import Node, BatchNode
+from pocketflow import Node, AsyncNode
+import asyncio
+import itertools
 import logging
+from collections import Counter
 from typing import Dict, List, Any
 
-from utils.config import load_config
+from utils.config import DEFAULT_BATCH_SIZE, load_config
 from utils.github_client import create_github_client
-from utils.repo_analyzer import analyze_repository
+from utils.repo_analyzer import RepositoryAnalyzer
+from utils.rule_classifier import build_topic_map, classify_by_rules
 from utils.star_list_manager import create_star_list_manager
 
-class InitializeNode(Node):
-    """Initialize configuration and validate API credentials"""
+class InitializeNode(AsyncNode):
+    """Initialize configuration and validate API credentials
     
-    def prep(self, shared):
-        # Load configuration from environment variables or config file
-        config = load_config()
+    The first page of starred repositories is requested concurrently with the
+    authentication check, so AnalyzeRepositoriesNode can start on it without
+    waiting another GitHub round trip.
+    """
+    
+    async def prep_async(self, shared):
+        # Load configuration from environment variables or config file, with
+        # per-run options (e.g. CLI flags) applied on top
+        config = load_config(run_config=shared.get("run_config"))
         return config
     
-    def exec(self, config):
+    async def exec_async(self, config):
         # Validate configuration
         config.validate()
         
-        # Test GitHub API connection
-        github_client = create_github_client(config.get("github_token"))
-        user_info = github_client.get_user_info()
+        # Test GitHub API connection while the first starred page is fetched
+        github_client = create_github_client(config.get("github_token"), config.get("github_concurrency"))
+        if config.get("use_graphql"):
+            pages = github_client.get_starred_repos_graphql_stream()
+        else:
+            pages = github_client.get_starred_repos_stream()
+        first_page_task = asyncio.create_task(asyncio.to_thread(next, pages, None))
+        try:
+            user_info = await asyncio.to_thread(github_client.get_user_info)
+        except Exception:
+            # Authentication failed. The page request keeps running in its worker
+            # thread until it returns; cancelling only discards its result, so a
+            # failure there (e.g. the same bad token) is not logged as unretrieved
+            first_page_task.cancel()
+            raise
+        first_page = await first_page_task
         
         logging.info(f"Successfully authenticated as GitHub user: {user_info['login']}")
         
         return {
             "config": config.to_dict(),
             "github_client": github_client,
-            "user_info": user_info
+            "user_info": user_info,
+            # Remaining pages keep streaming from the same generator
+            "starred_pages": itertools.chain([first_page] if first_page else [], pages)
         }
     
-    def post(self, shared, prep_res, exec_res):
+    async def post_async(self, shared, prep_res, exec_res):
         shared["config"] = exec_res["config"]
         shared["github_client"] = exec_res["github_client"]
         shared["user_info"] = exec_res["user_info"]
+        shared["starred_pages"] = exec_res["starred_pages"]
         
         logging.info("Configuration initialized successfully")
         return "default"
 
-class FetchStarredReposNode(Node):
-    """Fetch user's starred repositories"""
-    
-    def prep(self, shared):
-        github_client = shared["github_client"]
-        return github_client
-    
-    def exec(self, github_client):
-        # Fetch starred repositories
-        starred_repos = github_client.get_starred_repos()
-        logging.info(f"Fetched {len(starred_repos)} starred repositories")
-        return starred_repos
-    
-    def post(self, shared, prep_res, exec_res):
-        shared["starred_repos"] = exec_res
-        return "default"
-
 class ModeDecisionNode(Node):
     """Decide processing mode and fetch existing star lists if needed"""
     
     def prep(self, shared):
         config = shared["config"]
         github_client = shared["github_client"]
-        return config["mode"], github_client
+        return config["mode"], github_client, config
     
     def exec(self, inputs):
-        mode, github_client = inputs
+        mode, github_client, config = inputs
         
         if mode == "existing_lists":
-            # Fetch existing star lists
-            star_list_manager = create_star_list_manager(github_client)
+            # Fetch existing star lists; the manager is shared with
+            # ManageStarListsNode so the lists are not fetched twice
+            star_list_manager = create_star_list_manager(github_client, config)
             existing_lists = star_list_manager.get_existing_lists()
             
             logging.info(f"Found {len(existing_lists)} existing star lists")
@@ -77,151 +87,223 @@ class ModeDecisionNode(Node):
             return {
                 "mode": mode,
                 "existing_lists": existing_lists,
-                "existing_categories": [lst["name"] for lst in existing_lists]
+                "existing_categories": [lst["name"] for lst in existing_lists],
+                "star_list_manager": star_list_manager
             }
         else:
             return {
                 "mode": "auto",
                 "existing_lists": [],
-                "existing_categories": []
+                "existing_categories": [],
+                "star_list_manager": None
             }
     
     def post(self, shared, prep_res, exec_res):
         shared["mode"] = exec_res["mode"]
         shared["existing_lists"] = exec_res["existing_lists"]
         shared["existing_categories"] = exec_res["existing_categories"]
+        shared["star_list_manager"] = exec_res["star_list_manager"]
         
         logging.info(f"Operating in {exec_res['mode']} mode")
         return "default"
 
-class AnalyzeRepositoriesNode(BatchNode):
-    """Use AI to analyze and classify each repository"""
+class AnalyzeRepositoriesNode(AsyncNode):
+    """Fetch starred repositories and use AI to classify them concurrently
     
-    def prep(self, shared):
-        starred_repos = shared["starred_repos"]
+    GitHub pages are fetched by a producer task that feeds a queue, while a
+    pool of workers analyzes repositories as soon as they arrive, so LLM work
+    starts on the first page instead of after the last one. Each queue item is
+    a batch of up to ``batch_size`` repositories classified in one LLM call.
+    Repositories matched by a high-confidence rule skip the LLM entirely.
+    """
+    
+    async def prep_async(self, shared):
         config = shared["config"]
-        existing_categories = shared.get("existing_categories", [])
-        mode = shared.get("mode", "auto")
         
-        # Filter out excluded repositories
-        exclude_repos = config.get("exclude_repos", [])
-        filtered_repos = []
+        return {
+            "github_client": shared["github_client"],
+            "config": config,
+            "existing_categories": shared.get("existing_categories", []),
+            "mode": shared.get("mode", "auto"),
+            # One analyzer for the whole run, so identical repositories
+            # (e.g. forks) share its in-process memo
+            "analyzer": RepositoryAnalyzer(shared.get("existing_categories", []), config),
+            # Pages already requested by InitializeNode, if any
+            "starred_pages": shared.get("starred_pages"),
+            # Sets make the per-repo membership tests O(1)
+            "exclude_repos": frozenset(config.get("exclude_repos") or ()),
+            "existing_category_set": frozenset(shared.get("existing_categories") or ()),
+            "concurrency": config.get("llm_concurrency") or 8,
+            "batch_size": config.get("batch_size") or DEFAULT_BATCH_SIZE,
+            "rule_based_classification": config.get("rule_based_classification", True),
+            "topic_map": build_topic_map(config.get("topic_map_overrides")),
+            "on_progress": shared.get("on_progress")
+        }
+    
+    async def exec_async(self, inputs):
+        github_client = inputs["github_client"]
+        exclude_repos = inputs["exclude_repos"]
+        concurrency = inputs["concurrency"]
+        batch_size = inputs["batch_size"]
+        use_rules = inputs["rule_based_classification"]
+        on_progress = inputs["on_progress"]
         
-        for repo in starred_repos:
-            if repo["full_name"] not in exclude_repos:
-                # Include necessary context information for each repo
-                filtered_repos.append((repo, existing_categories, mode, config))
+        queue = asyncio.Queue(maxsize=concurrency * 2)
+        starred_repos = []
+        classification_results = {}
+        rule_hits = 0
+        total = 0
         
-        logging.info(f"Analyzing {len(filtered_repos)} repositories (excluded {len(starred_repos) - len(filtered_repos)})")
-        return filtered_repos
-    
-    def exec(self, repo_data):
-        # repo_data is a tuple of (repo, existing_categories, mode, config)
-        repo, existing_categories, mode, config = repo_data
+        def report_progress():
+            # Total grows as pages arrive, so report both numbers each time
+            if on_progress:
+                on_progress(len(classification_results), total)
         
-        # Use AI to analyze repository
+        async def produce():
+            nonlocal rule_hits, total
+            pages = inputs["starred_pages"] or github_client.get_starred_repos_stream()
+            while True:
+                # The GitHub client is blocking, so page in a worker thread
+                page_repos = await asyncio.to_thread(next, pages, None)
+                if page_repos is None:
+                    break
+                
+                starred_repos.extend(page_repos)
+                
+                # Filter out excluded repositories
+                repos = [repo for repo in page_repos if repo["full_name"] not in exclude_repos]
+                total += len(repos)
+                
+                if use_rules:
+                    llm_needed = []
+                    for repo in repos:
+                        result = classify_by_rules(
+                            repo, inputs["existing_category_set"], inputs["mode"], inputs["topic_map"]
+                        )
+                        if result:
+                            classification_results[repo["full_name"]] = result
+                            rule_hits += 1
+                        else:
+                            llm_needed.append(repo)
+                    repos = llm_needed
+                report_progress()
+                
+                for i in range(0, len(repos), batch_size):
+                    await queue.put(repos[i:i + batch_size])
+        
+        async def consume():
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                classification_results.update(await self._analyze_batch(batch, inputs))
+                report_progress()
+        
+        workers = [asyncio.create_task(consume()) for _ in range(concurrency)]
+        try:
+            await produce()
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        
+        logging.info(f"Fetched {len(starred_repos)} starred repositories")
+        logging.info(f"Analyzed {len(classification_results)} repositories (excluded {len(starred_repos) - len(classification_results)}, {rule_hits} classified by rules)")
+        return starred_repos, classification_results
+    
+    async def _analyze_batch(self, repos, inputs):
+        # Use AI to analyze a batch of repositories
         try:
-            result = analyze_repository(repo, existing_categories, mode, config)
-            logging.info(f"Analyzed {repo['full_name']}: {result['category']} (confidence: {result['confidence']:.2f})")
-            return repo["full_name"], result
+            results = await inputs["analyzer"].analyze_batch_async(repos, inputs["mode"])
         except Exception as e:
-            logging.error(f"Failed to analyze {repo['full_name']}: {e}")
-            return repo["full_name"], {
-                "category": "Uncategorized",
-                "reason": f"Analysis failed: {str(e)}",
-                "confidence": 0.1
+            logging.error(f"Failed to analyze {', '.join(repo['full_name'] for repo in repos)}: {e}")
+            return {
+                repo["full_name"]: {
+                    "category": "Uncategorized",
+                    "reason": f"Analysis failed: {str(e)}",
+                    "confidence": 0.1
+                }
+                for repo in repos
             }
+        
+        for repo_name, result in results.items():
+            logging.info(f"Analyzed {repo_name}: {result['category']} (confidence: {result['confidence']:.2f})")
+        return results
     
-    def post(self, shared, prep_res, exec_res_list):
-        # Organize analysis results as dictionary
-        classification_results = {}
-        for repo_name, result in exec_res_list:
-            classification_results[repo_name] = result
+    async def post_async(self, shared, prep_res, exec_res):
+        starred_repos, classification_results = exec_res
         
+        shared["starred_repos"] = starred_repos
+        # Index starred repos by name once, for grouping them by category later
+        shared["repo_by_name"] = {repo["full_name"]: repo for repo in starred_repos}
         shared["classification_results"] = classification_results
         
         # Count classification results
-        categories = {}
-        for result in classification_results.values():
-            category = result["category"]
-            categories[category] = categories.get(category, 0) + 1
+        categories = Counter(result["category"] for result in classification_results.values())
         
-        logging.info(f"Classification complete. Categories: {categories}")
+        logging.info(f"Classification complete. Categories: {dict(categories)}")
         return "default"
 
-class ManageStarListsNode(Node):
-    """Create or update star lists based on classification results"""
+class ManageStarListsNode(AsyncNode):
+    """Create or update star lists based on classification results
     
-    def prep(self, shared):
+    Categories are independent, so list mutations for different categories run
+    concurrently, bounded by ``github_concurrency``.
+    """
+    
+    async def prep_async(self, shared):
         github_client = shared["github_client"]
         classification_results = shared["classification_results"]
-        starred_repos = shared["starred_repos"]
         config = shared["config"]
         
         return {
             "github_client": github_client,
             "classification_results": classification_results,
-            "starred_repos": starred_repos,
+            "repo_by_name": shared["repo_by_name"],
             "dry_run": config.get("dry_run", False),
-            "config": config
+            "config": config,
+            "star_list_manager": shared.get("star_list_manager"),
+            "existing_lists": shared.get("existing_lists")
         }
     
-    def exec(self, inputs):
+    async def exec_async(self, inputs):
         github_client = inputs["github_client"]
         classification_results = inputs["classification_results"]
-        starred_repos = inputs["starred_repos"]
+        repo_by_name = inputs["repo_by_name"]
         dry_run = inputs["dry_run"]
         config = inputs.get("config", {})
         
-        # Create star list manager with config
-        star_list_manager = create_star_list_manager(github_client, config)
+        # Reuse the star list manager (and the lists it already fetched) from
+        # ModeDecisionNode when available
+        star_list_manager = inputs.get("star_list_manager")
+        if star_list_manager:
+            existing_lists = inputs["existing_lists"]
+        else:
+            star_list_manager = create_star_list_manager(github_client, config)
+            existing_lists = star_list_manager.get_existing_lists()
         
         # Configure summary options
         summary_options = config.get("summary_options", {})
         if summary_options:
             star_list_manager.set_summary_options(**summary_options)
         
-        # Get existing lists for summary completion
-        existing_lists = star_list_manager.get_existing_lists()
-        
         # Organize repositories based on classification results
         organized_repos = star_list_manager.organize_repos_by_category(
-            classification_results, starred_repos
+            classification_results, repo_by_name=repo_by_name
         )
         
         # Complete/enhance list summaries
-        enhanced_summaries = star_list_manager.complete_list_summaries(
+        enhanced_summaries = await star_list_manager.acomplete_list_summaries(
             existing_lists, organized_repos
         )
         
-        # Execute batch operations with enhanced summaries
-        results = {}
-        for category, repos in organized_repos.items():
-            if not repos:
-                continue
-                
-            enhanced_description = enhanced_summaries.get(category, "")
-            
-            if dry_run:
-                results[category] = {
-                    "success": True,
-                    "action": "dry_run",
-                    "repos_count": len(repos),
-                    "repos": [repo["full_name"] for repo in repos],
-                    "enhanced_description": enhanced_description
-                }
-                logging.info(f"DRY RUN: Would create/update list '{category}' with {len(repos)} repos")
-                logging.info(f"Enhanced description: {enhanced_description}")
-            else:
-                try:
-                    result = star_list_manager.create_or_update_list(
-                        category, enhanced_description, repos
-                    )
-                    result["enhanced_description"] = enhanced_description
-                    results[category] = result
-                except Exception as e:
-                    logging.error(f"Failed to process category '{category}': {e}")
-                    results[category] = {"success": False, "error": str(e)}
+        # Apply the enhanced summaries; different lists are updated concurrently
+        results = await asyncio.to_thread(
+            star_list_manager.execute_batch_operations, organized_repos,
+            dry_run, config.get("dry_run_repo_names", True), enhanced_summaries
+        )
         
         return {
             "organized_repos": organized_repos,
@@ -229,7 +311,7 @@ class ManageStarListsNode(Node):
             "enhanced_summaries": enhanced_summaries
         }
     
-    def post(self, shared, prep_res, exec_res):
+    async def post_async(self, shared, prep_res, exec_res):
         shared["organized_repos"] = exec_res["organized_repos"]
         shared["operation_results"] = exec_res["operation_results"]
         
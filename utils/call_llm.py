@@ -1,22 +1,54 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, BadRequestError
+import asyncio
 import os
 import logging
+import weakref
+import httpx
 from typing import Optional
 
+try:
+    from utils.config import load_config, get_env
+except ImportError:
+    # Allow using this module without the rest of the package
+    load_config = None
+    
+    def get_env(key: str, default: Optional[str] = None) -> Optional[str]:
+        return os.environ.get(key, default)
+
 # Global client instance for reuse
 _client_cache = {}
 
-def get_llm_client(api_key: str = None, base_url: str = None) -> OpenAI:
+# Async clients (and their httpx connection pools) are bound to the event loop
+# they were created on, so they are cached per loop and dropped with it
+_async_client_cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+# HTTP/2 multiplexes concurrent requests over one connection; pool limits are
+# sized for the concurrent repository analysis fan-out
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# (base_url, model) backends that rejected response_format; later calls to them
+# skip JSON mode instead of failing again
+_json_mode_unsupported = set()
+
+# The OpenAI SDK retries rate limits (429), 5xx and connection errors itself,
+# with jittered exponential backoff that honors Retry-After
+DEFAULT_MAX_RETRIES = 5
+
+def get_llm_client(api_key: str = None, base_url: str = None,
+                   max_retries: int = None) -> OpenAI:
     """Get or create OpenAI client with specified configuration"""
     # Use configuration from parameters or environment variables
-    api_key = api_key or os.environ.get("OPENAI_API_KEY")
-    base_url = base_url or os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
+    api_key = api_key or get_env("OPENAI_API_KEY")
+    base_url = base_url or get_env("OPENAI_API_BASE", "https://api.openai.com/v1")
     
     if not api_key:
         raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
     
+    max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+    
     # Create cache key
-    cache_key = f"{api_key[:8]}_{base_url}"
+    cache_key = f"{api_key[:8]}_{base_url}_{max_retries}"
     
     # Return cached client if available
     if cache_key in _client_cache:
@@ -24,9 +56,12 @@ def get_llm_client(api_key: str = None, base_url: str = None) -> OpenAI:
     
     # Create new client
     try:
+        http_client = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
         client = OpenAI(
             api_key=api_key,
-            base_url=base_url
+            base_url=base_url,
+            max_retries=max_retries,
+            http_client=http_client
         )
         _client_cache[cache_key] = client
         logging.debug(f"Created new OpenAI client for base_url: {base_url}")
@@ -35,9 +70,64 @@ def get_llm_client(api_key: str = None, base_url: str = None) -> OpenAI:
         logging.error(f"Failed to create OpenAI client: {e}")
         raise
 
+def get_async_llm_client(api_key: str = None, base_url: str = None,
+                         max_retries: int = None) -> AsyncOpenAI:
+    """Get or create AsyncOpenAI client with specified configuration
+    
+    Must be called from a running event loop; each loop gets its own client,
+    so separate asyncio.run calls never share a client bound to a closed loop.
+    """
+    api_key = api_key or get_env("OPENAI_API_KEY")
+    base_url = base_url or get_env("OPENAI_API_BASE", "https://api.openai.com/v1")
+    
+    if not api_key:
+        raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
+    
+    max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max_retries
+    
+    loop_clients = _async_client_cache.setdefault(asyncio.get_running_loop(), {})
+    cache_key = f"{api_key[:8]}_{base_url}_{max_retries}"
+    
+    if cache_key in loop_clients:
+        return loop_clients[cache_key]
+    
+    try:
+        http_client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=max_retries,
+            http_client=http_client
+        )
+        loop_clients[cache_key] = client
+        logging.debug(f"Created new AsyncOpenAI client for base_url: {base_url}")
+        return client
+    except Exception as e:
+        logging.error(f"Failed to create AsyncOpenAI client: {e}")
+        raise
+
+def _build_request_params(prompt: str, model: str, max_tokens: int = None,
+                          temperature: float = None, response_format: dict = None) -> dict:
+    """Build chat completion request parameters"""
+    request_params = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}]
+    }
+    
+    # Add optional parameters if provided
+    if max_tokens:
+        request_params["max_tokens"] = max_tokens
+    if temperature is not None:
+        request_params["temperature"] = temperature
+    if response_format:
+        request_params["response_format"] = response_format
+    
+    return request_params
+
 def call_llm(prompt: str, model: str = None, api_key: str = None, 
              base_url: str = None, max_tokens: int = None, 
-             temperature: float = None) -> str:
+             temperature: float = None, response_format: dict = None,
+             max_retries: int = None) -> str:
     """
     Call LLM with configurable parameters
     
@@ -48,28 +138,21 @@ def call_llm(prompt: str, model: str = None, api_key: str = None,
         base_url: API base URL (defaults to OPENAI_API_BASE env var)
         max_tokens: Maximum tokens to generate
         temperature: Sampling temperature (0-2)
+        response_format: Optional response format, e.g. {"type": "json_object"}
+        max_retries: Retries for transient errors (defaults to DEFAULT_MAX_RETRIES)
     
     Returns:
         Generated text response
     """
     # Get configuration from environment if not provided
-    model = model or os.environ.get("AI_MODEL", "gpt-4o-mini")
+    model = model or get_env("AI_MODEL", "gpt-4o-mini")
     
     try:
         # Get configured client
-        client = get_llm_client(api_key=api_key, base_url=base_url)
+        client = get_llm_client(api_key=api_key, base_url=base_url, max_retries=max_retries)
         
         # Prepare request parameters
-        request_params = {
-            "model": model,
-            "messages": [{"role": "user", "content": prompt}]
-        }
-        
-        # Add optional parameters if provided
-        if max_tokens:
-            request_params["max_tokens"] = max_tokens
-        if temperature is not None:
-            request_params["temperature"] = temperature
+        request_params = _build_request_params(prompt, model, max_tokens, temperature, response_format)
         
         # Make API call
         response = client.chat.completions.create(**request_params)
@@ -85,35 +168,130 @@ def call_llm(prompt: str, model: str = None, api_key: str = None,
         logging.error(f"LLM API call failed: {e}")
         raise
 
-def call_llm_with_config(prompt: str, config: dict = None) -> str:
+async def acall_llm(prompt: str, model: str = None, api_key: str = None,
+                    base_url: str = None, max_tokens: int = None,
+                    temperature: float = None, response_format: dict = None,
+                    max_retries: int = None) -> str:
+    """
+    Async variant of call_llm, for running many requests concurrently
+    
+    Args:
+        prompt: The input prompt
+        model: Model name (defaults to AI_MODEL env var or gpt-4o-mini)
+        api_key: API key (defaults to OPENAI_API_KEY env var)
+        base_url: API base URL (defaults to OPENAI_API_BASE env var)
+        max_tokens: Maximum tokens to generate
+        temperature: Sampling temperature (0-2)
+        response_format: Optional response format, e.g. {"type": "json_object"}
+        max_retries: Retries for transient errors (defaults to DEFAULT_MAX_RETRIES)
+    
+    Returns:
+        Generated text response
+    """
+    model = model or get_env("AI_MODEL", "gpt-4o-mini")
+    
+    try:
+        client = get_async_llm_client(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        request_params = _build_request_params(prompt, model, max_tokens, temperature, response_format)
+        
+        response = await client.chat.completions.create(**request_params)
+        
+        content = response.choices[0].message.content
+        if not content:
+            raise ValueError("LLM returned empty response")
+        
+        return content
+        
+    except Exception as e:
+        logging.error(f"LLM API call failed: {e}")
+        raise
+
+def _resolve_config(config: dict = None) -> dict:
+    """Return the given config, or load it when not provided"""
+    if not config:
+        # Load config if not provided, falling back to environment variables
+        config = load_config().to_dict() if load_config else {}
+    return config
+
+def _llm_params(config: dict) -> dict:
+    """call_llm keyword arguments taken from a configuration dictionary"""
+    return {
+        "model": config.get("ai_model"),
+        "api_key": config.get("openai_api_key"),
+        "base_url": config.get("openai_api_base"),
+        "max_tokens": config.get("max_tokens"),
+        "temperature": config.get("temperature"),
+        "max_retries": config.get("llm_max_retries"),
+    }
+
+def _json_mode_backend(config: dict) -> tuple:
+    return (config.get("openai_api_base"), config.get("ai_model"))
+
+def _effective_response_format(config: dict, response_format: dict = None) -> Optional[dict]:
+    """Drop response_format when JSON mode is disabled or the backend rejected it before"""
+    if not response_format or not config.get("json_mode", True):
+        return None
+    if _json_mode_backend(config) in _json_mode_unsupported:
+        return None
+    return response_format
+
+def _mark_json_mode_unsupported(config: dict, error: Exception):
+    backend = _json_mode_backend(config)
+    _json_mode_unsupported.add(backend)
+    logging.warning(f"Model {backend[1]} rejected JSON mode, retrying without response_format "
+                    f"(set json_mode: false to skip it): {error}")
+
+def call_llm_with_config(prompt: str, config: dict = None,
+                         response_format: dict = None) -> str:
     """
     Call LLM using configuration object
     
+    response_format is only sent when ``json_mode`` is enabled; if the backend
+    rejects it with a 400, the call is retried once without it and JSON mode
+    stays off for that backend.
+    
     Args:
         prompt: The input prompt
         config: Configuration dictionary with LLM settings
+        response_format: Optional response format, e.g. {"type": "json_object"}
     
     Returns:
         Generated text response
     """
-    if not config:
-        # Load config if not provided
-        try:
-            from utils.config import load_config
-            cfg = load_config()
-            config = cfg.to_dict()
-        except ImportError:
-            # Fallback to environment variables
-            config = {}
-    
-    return call_llm(
-        prompt=prompt,
-        model=config.get("ai_model"),
-        api_key=config.get("openai_api_key"),
-        base_url=config.get("openai_api_base"),
-        max_tokens=config.get("max_tokens"),
-        temperature=config.get("temperature")
-    )
+    config = _resolve_config(config)
+    response_format = _effective_response_format(config, response_format)
+    
+    try:
+        return call_llm(prompt=prompt, response_format=response_format, **_llm_params(config))
+    except BadRequestError as e:
+        if not response_format:
+            raise
+        _mark_json_mode_unsupported(config, e)
+        return call_llm(prompt=prompt, **_llm_params(config))
+
+async def acall_llm_with_config(prompt: str, config: dict = None,
+                                response_format: dict = None) -> str:
+    """
+    Async variant of call_llm_with_config
+    
+    Args:
+        prompt: The input prompt
+        config: Configuration dictionary with LLM settings
+        response_format: Optional response format, e.g. {"type": "json_object"}
+    
+    Returns:
+        Generated text response
+    """
+    config = _resolve_config(config)
+    response_format = _effective_response_format(config, response_format)
+    
+    try:
+        return await acall_llm(prompt=prompt, response_format=response_format, **_llm_params(config))
+    except BadRequestError as e:
+        if not response_format:
+            raise
+        _mark_json_mode_unsupported(config, e)
+        return await acall_llm(prompt=prompt, **_llm_params(config))
 
 def test_llm_connection(api_key: str = None, base_url: str = None, 
                        model: str = None) -> bool:
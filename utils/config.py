@@ -1,7 +1,154 @@
 import os
-import json
+import copy
+import functools
+import orjson
 import yaml
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+# Prefer the libyaml-backed loader, which is much faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Repositories classified per LLM call when batch_size is unset
+DEFAULT_BATCH_SIZE = 10
+
+
+@functools.lru_cache(maxsize=16)
+def _read_config_file(config_file: str, mtime_ns: int, size: int) -> Any:
+    """Parse a config file; cached per modification time and size so edits are picked up"""
+    if config_file.endswith(('.yaml', '.yml')):
+        with open(config_file, 'r', encoding='utf-8', buffering=1 << 16) as f:
+            return yaml.load(f, Loader=_SafeLoader)
+    
+    # orjson parses UTF-8 bytes directly, so skip the text decode
+    with open(config_file, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def invalidate_config_cache():
+    """Drop cached parsed config files"""
+    _read_config_file.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def get_env(key: str, default: Optional[str] = None) -> Optional[str]:
+    """Read an environment variable once per process
+    
+    Call invalidate_env_cache() after changing os.environ at runtime.
+    """
+    return os.environ.get(key, default)
+
+
+def invalidate_env_cache():
+    """Drop cached environment variable reads"""
+    get_env.cache_clear()
+
+def _bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _int_or_none(value: str) -> Optional[int]:
+    # "0" means unset, e.g. MAX_TOKENS=0 lets the API pick a limit
+    return None if not value or value == "0" else int(value)
+
+
+def _float_or_none(value: str) -> Optional[float]:
+    return (float(value) or None) if value else None
+
+
+def _split_list(value: str) -> list:
+    return [item for item in map(str.strip, value.split(",")) if item]
+
+
+def _from_env(env_var: str, parse, default: Optional[str]):
+    value = get_env(env_var, default)
+    return parse(value) if value is not None else None
+
+
+# (config key, environment variable, parser, default) for the environment-derived defaults
+_ENV_SPEC = (
+    ("github_token", "GITHUB_TOKEN", str, None),
+    ("openai_api_key", "OPENAI_API_KEY", str, None),
+    ("openai_api_base", "OPENAI_API_BASE", str, "https://api.openai.com/v1"),
+    ("mode", "STAR_TIDY_MODE", str, "auto"),
+    ("exclude_repos", "EXCLUDE_REPOS", _split_list, ""),
+    ("max_repos_per_request", "MAX_REPOS_PER_REQUEST", int, "100"),
+    ("ai_model", "AI_MODEL", str, "gpt-4o-mini"),
+    ("llm_concurrency", "LLM_CONCURRENCY", int, "8"),
+    ("llm_max_retries", "LLM_MAX_RETRIES", int, "5"),
+    ("github_concurrency", "GITHUB_CONCURRENCY", int, "4"),
+    ("batch_size", "BATCH_SIZE", int, str(DEFAULT_BATCH_SIZE)),
+    ("rule_based_classification", "RULE_BASED_CLASSIFICATION", _bool, "true"),
+    ("use_graphql", "USE_GRAPHQL", _bool, "false"),
+    ("max_tokens", "MAX_TOKENS", _int_or_none, None),
+    ("temperature", "TEMPERATURE", _float_or_none, None),
+    ("json_mode", "JSON_MODE", _bool, "true"),
+    ("dry_run", "DRY_RUN", _bool, "false"),
+    ("dry_run_repo_names", "DRY_RUN_REPO_NAMES", _bool, "true"),
+    ("use_cache", "USE_CACHE", _bool, "true"),
+    ("cache_dir", "STAR_TIDY_CACHE_DIR", str, os.path.join("~", ".star-tidy", "cache")),
+)
+
+_SUMMARY_ENV_SPEC = (
+    ("auto_complete", "AUTO_COMPLETE_SUMMARIES", _bool, "true"),
+    ("enhance_existing", "ENHANCE_EXISTING_SUMMARIES", _bool, "true"),
+    ("use_ai_summary", "USE_AI_SUMMARY", _bool, "true"),
+    ("include_stats", "INCLUDE_STATS", _bool, "true"),
+)
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    """Options given for a single run, e.g. CLI flags
+    
+    Fields left as None are not overridden, so environment variables and the
+    config file still apply to them.
+    """
+    config_file: Optional[str] = None
+    mode: Optional[str] = None
+    dry_run: Optional[bool] = None
+    exclude_repos: Optional[Tuple[str, ...]] = None
+    ai_model: Optional[str] = None
+    openai_api_base: Optional[str] = None
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    use_cache: Optional[bool] = None
+    auto_complete_summaries: Optional[bool] = None
+    enhance_existing_summaries: Optional[bool] = None
+    use_ai_summary: Optional[bool] = None
+    include_stats: Optional[bool] = None
+    
+    def overrides(self) -> Dict[str, Any]:
+        """Return the configuration keys this run overrides"""
+        overrides = {
+            key: value for key, value in (
+                ("mode", self.mode),
+                ("dry_run", self.dry_run),
+                ("exclude_repos", list(self.exclude_repos) if self.exclude_repos else None),
+                ("ai_model", self.ai_model),
+                ("openai_api_base", self.openai_api_base),
+                ("max_tokens", self.max_tokens),
+                ("temperature", self.temperature),
+                ("use_cache", self.use_cache),
+            ) if value is not None
+        }
+        
+        summary_options = {
+            key: value for key, value in (
+                ("auto_complete", self.auto_complete_summaries),
+                ("enhance_existing", self.enhance_existing_summaries),
+                ("use_ai_summary", self.use_ai_summary),
+                ("include_stats", self.include_stats),
+            ) if value is not None
+        }
+        if summary_options:
+            overrides["summary_options"] = summary_options
+        
+        return overrides
+
 
 class Config:
     """Configuration manager supporting environment variables, JSON and YAML files"""
@@ -12,44 +159,35 @@ class Config:
     
     def load_config(self, config_file: str = None):
         """Load configuration"""
-        # Default configuration
-        exclude_repos_str = os.environ.get("EXCLUDE_REPOS", "")
-        exclude_repos = [repo.strip() for repo in exclude_repos_str.split(",") if repo.strip()]
-        
-        self.config = {
-            "github_token": os.environ.get("GITHUB_TOKEN"),
-            "openai_api_key": os.environ.get("OPENAI_API_KEY"),
-            "openai_api_base": os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1"),
-            "mode": os.environ.get("STAR_TIDY_MODE", "auto"),
-            "exclude_repos": exclude_repos,
-            "custom_categories": {},
-            "max_repos_per_request": int(os.environ.get("MAX_REPOS_PER_REQUEST", "100")),
-            "ai_model": os.environ.get("AI_MODEL", "gpt-4o-mini"),
-            "max_tokens": int(os.environ.get("MAX_TOKENS", "0")) or None,
-            "temperature": float(os.environ.get("TEMPERATURE", "0")) or None,
-            "dry_run": os.environ.get("DRY_RUN", "false").lower() == "true",
-            "summary_options": {
-                "auto_complete": os.environ.get("AUTO_COMPLETE_SUMMARIES", "true").lower() == "true",
-                "enhance_existing": os.environ.get("ENHANCE_EXISTING_SUMMARIES", "true").lower() == "true",
-                "use_ai_summary": os.environ.get("USE_AI_SUMMARY", "true").lower() == "true",
-                "include_stats": os.environ.get("INCLUDE_STATS", "true").lower() == "true",
-            }
-        }
+        # Default configuration from environment variables
+        self.config = {key: _from_env(env_var, parse, default)
+                       for key, env_var, parse, default in _ENV_SPEC}
+        self.config["custom_categories"] = {}
+        self.config["topic_map_overrides"] = {}
+        self.config["summary_options"] = {key: _from_env(env_var, parse, default)
+                                          for key, env_var, parse, default in _SUMMARY_ENV_SPEC}
         
         # Load from configuration file
         if config_file and os.path.exists(config_file):
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    if config_file.endswith('.yaml') or config_file.endswith('.yml'):
-                        file_config = yaml.safe_load(f)
-                    else:
-                        file_config = json.load(f)
+                # Size also changes on most edits made within the mtime granularity
+                st = os.stat(config_file)
+                # Copy so callers can't mutate the cached parse result
+                file_config = copy.deepcopy(_read_config_file(config_file, st.st_mtime_ns, st.st_size))
                 
                 # Merge configuration, file config has higher priority than environment variables
                 self.config.update(file_config)
             except Exception as e:
                 print(f"Warning: Failed to load config file {config_file}: {e}")
     
+    def apply_run_config(self, run_config: RunConfig):
+        """Apply per-run overrides, which take priority over files and environment variables"""
+        for key, value in run_config.overrides().items():
+            if key == "summary_options":
+                self.config["summary_options"] = {**(self.config.get("summary_options") or {}), **value}
+            else:
+                self.config[key] = value
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
         return self.config.get(key, default)
@@ -77,11 +215,14 @@ class Config:
         return self.config.copy()
 
 
-def load_config(config_file: str = None) -> Config:
+def load_config(config_file: str = None, run_config: RunConfig = None) -> Config:
     """Convenience function to load configuration"""
-    # Check for CONFIG_FILE environment variable first
+    if not config_file and run_config:
+        config_file = run_config.config_file
+    
+    # Check for CONFIG_FILE environment variable next
     if not config_file:
-        config_file = os.environ.get("CONFIG_FILE")
+        config_file = get_env("CONFIG_FILE")
     
     # Try to load configuration file from common locations
     if not config_file:
@@ -94,12 +235,22 @@ def load_config(config_file: str = None) -> Config:
             ".star-tidy.json"
         ]
         
+        # One directory listing instead of a stat() per candidate
+        try:
+            with os.scandir(".") as entries:
+                names = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            names = set()
+        
         for file_path in possible_files:
-            if os.path.exists(file_path):
+            if file_path in names:
                 config_file = file_path
                 break
     
-    return Config(config_file)
+    config = Config(config_file)
+    if run_config:
+        config.apply_run_config(run_config)
+    return config
 
 
 if __name__ == "__main__":
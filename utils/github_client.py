@@ -1,13 +1,60 @@
+import copy
 import requests
-import os
 import logging
-from typing import Dict, List, Optional
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.config import get_env
+
+# 可选：ijson的C后端可以边下载边解析，只保留需要的字段
+try:
+    import ijson.backends.yajl2_c as _ijson
+except ImportError:
+    _ijson = None
+
+# 并发获取starred分页时的最大线程数
+STARRED_PAGE_WORKERS = 8
+
+# 单次star list items请求最多携带的repository id数量
+LIST_ITEMS_CHUNK_SIZE = 50
+
+# 共享Session的默认连接池大小
+DEFAULT_POOL_MAXSIZE = 32
+
+# GraphQL查询starred repositories，只请求用到的字段，按star时间倒序（与REST一致）
+_STARRED_REPOS_QUERY = """
+query($login: String!, $isViewer: Boolean!, $first: Int!, $after: String) {
+  viewer @include(if: $isViewer) { ...starred }
+  user(login: $login) @skip(if: $isViewer) { ...starred }
+}
+fragment starred on User {
+  starredRepositories(first: $first, after: $after, orderBy: {field: STARRED_AT, direction: DESC}) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      databaseId name nameWithOwner description isArchived pushedAt stargazerCount
+      primaryLanguage { name }
+      repositoryTopics(first: 20) { nodes { topic { name } } }
+    }
+  }
+}
+"""
+
+# 分析和整理star lists用到的repository字段，其余字段（owner、license等）不保留
+STARRED_REPO_FIELDS = (
+    "id", "name", "full_name", "description", "language", "topics",
+    "stargazers_count", "archived", "pushed_at",
+)
 
 class GitHubClient:
     """GitHub API客户端，用于与GitHub API交互"""
     
-    def __init__(self, token: str = None):
-        self.token = token or os.environ.get("GITHUB_TOKEN")
+    def __init__(self, token: str = None, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        self.token = token or get_env("GITHUB_TOKEN")
         if not self.token:
             raise ValueError("GitHub token is required. Set GITHUB_TOKEN environment variable.")
         
@@ -17,59 +64,217 @@ class GitHubClient:
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "StarTidy-Bot"
         }
+        
+        # 所有请求共用一个Session复用连接（keep-alive），并对限流和临时性服务端错误自动重试；
+        # 连接池要容纳所有并发请求，否则多出的连接用完即丢弃，下次请求又要重新握手
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            # 重试用尽后返回最后的响应，由raise_for_status抛出HTTPError
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        
+        # 条件请求缓存：(endpoint, params) -> (ETag, 解析后的响应, Link header)，304响应不消耗rate limit
+        self._etag_cache: Dict[Tuple, Tuple[str, Any, Dict]] = {}
+    
+    def close(self):
+        """关闭底层HTTP连接池"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
     
-    def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> Dict:
-        """发送HTTP请求到GitHub API"""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None,
+                 stream: bool = False, headers: Dict = None) -> requests.Response:
+        """发送HTTP请求到GitHub API并返回原始响应
+
+        endpoint可以是相对路径，也可以是完整URL（例如Link header中的下一页地址）
+        """
+        if endpoint.startswith("https://"):
+            url = endpoint
+        else:
+            url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
-                headers=self.headers,
                 json=data,
-                params=params
+                params=params,
+                stream=stream,
+                headers=headers
             )
             response.raise_for_status()
-            return response.json() if response.content else {}
+            return response
         except requests.exceptions.RequestException as e:
             logging.error(f"GitHub API request failed: {e}")
             raise
     
-    def get_starred_repos(self, username: str = None, per_page: int = 100) -> List[Dict]:
-        """获取用户的starred repositories"""
+    def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None,
+                      fields: Sequence[str] = None, conditional: bool = False,
+                      with_links: bool = False) -> Any:
+        """发送HTTP请求到GitHub API
+        
+        fields不为空时响应应为对象列表，每个对象只保留这些字段。
+        conditional为True时带上次的ETag发送If-None-Match，304时返回缓存的结果。
+        with_links为True时返回(结果, Link header)
+        """
+        cache_key = (endpoint, tuple(sorted((params or {}).items())), tuple(fields or ()))
+        cached = self._etag_cache.get(cache_key) if conditional else None
+        
+        response = self._request(method, endpoint, data=data, params=params,
+                                 stream=fields is not None and _ijson is not None,
+                                 headers={"If-None-Match": cached[0]} if cached else None)
+        if cached and response.status_code == 304:
+            response.close()
+            _, result, links = cached
+            result = copy.deepcopy(result)
+        else:
+            result = self._read_json(response, fields)
+            links = response.links
+            etag = response.headers.get("ETag") if conditional else None
+            if etag:
+                self._etag_cache[cache_key] = (etag, copy.deepcopy(result), links)
+        return (result, links) if with_links else result
+    
+    @staticmethod
+    def _read_json(response: requests.Response, fields: Sequence[str] = None):
+        """解析响应JSON，可选地只保留列表中每个对象的部分字段"""
+        if fields is None:
+            return response.json() if response.content else {}
+        
+        if _ijson is None:
+            items = response.json() if response.content else []
+            return [{key: item[key] for key in fields if key in item} for item in items]
+        
+        # 流式解析，不需要先把整个响应体解析成完整的对象
+        try:
+            response.raw.decode_content = True
+            return [{key: item[key] for key in fields if key in item}
+                    for item in _ijson.items(response.raw, "item", use_float=True)]
+        finally:
+            response.close()
+    
+    def get_starred_repos_stream(self, username: str = None, per_page: int = 100,
+                                 fields: Sequence[str] = STARRED_REPO_FIELDS) -> Iterator[List[Dict]]:
+        """逐页获取用户的starred repositories，每次yield一页
+        
+        第一页的Link header中rel="last"给出总页数，其余页面随后并发获取，
+        但仍按页码顺序yield，调用方可以在后续页面到达前开始处理已获取的数据。
+        每个repository只保留fields中的字段，传入None返回完整对象
+        """
         endpoint = f"users/{username}/starred" if username else "user/starred"
         
-        repos = []
-        page = 1
+        response = self._request("GET", endpoint, params={"per_page": per_page},
+                                 stream=fields is not None and _ijson is not None)
+        page_repos = self._read_json(response, fields) or []
+        if not page_repos:
+            return
+        yield page_repos
+        
+        if len(page_repos) < per_page:
+            return
+        
+        # GitHub API最多返回1000条记录
+        last_page = min(_last_page(response.links), -(-1000 // per_page))
+        
+        def fetch_page(page: int) -> List[Dict]:
+            return self._make_request("GET", endpoint, params={"per_page": per_page, "page": page},
+                                      fields=fields) or []
+        
+        yield from _fetch_remaining_pages(fetch_page, last_page, per_page)
+    
+    def graphql(self, query: str, variables: Dict = None) -> Dict:
+        """执行GraphQL查询并返回data部分，GraphQL错误会抛出RuntimeError"""
+        response = self._request("POST", "graphql", data={"query": query, "variables": variables or {}})
+        result = orjson.loads(response.content)
+        if result.get("errors"):
+            raise RuntimeError(f"GitHub GraphQL error: {result['errors'][0].get('message')}")
+        return result["data"]
+    
+    def get_starred_repos_graphql_stream(self, username: str = None,
+                                         per_page: int = 100) -> Iterator[List[Dict]]:
+        """通过GraphQL逐页获取starred repositories，每页都只包含用到的字段
+        
+        返回的repository使用与REST接口相同的字段名；第一页请求失败时回退到REST接口
+        """
+        variables = {"login": username or "", "isViewer": not username, "first": per_page, "after": None}
+        total = 0
         
         while True:
-            params = {"per_page": per_page, "page": page}
-            page_repos = self._make_request("GET", endpoint, params=params)
+            try:
+                data = self.graphql(_STARRED_REPOS_QUERY, variables)
+            except (requests.exceptions.RequestException, RuntimeError) as e:
+                if total:
+                    raise
+                logging.warning(f"GraphQL starred repositories query failed, falling back to REST: {e}")
+                yield from self.get_starred_repos_stream(username, per_page)
+                return
             
+            starred = (data.get("viewer") or data.get("user") or {}).get("starredRepositories") or {}
+            page_repos = [_repo_from_graphql(node) for node in starred.get("nodes") or [] if node]
             if not page_repos:
-                break
-                
-            repos.extend(page_repos)
+                return
             
-            # GitHub API最多返回1000条记录
-            if len(page_repos) < per_page or len(repos) >= 1000:
-                break
-                
-            page += 1
-        
+            yield page_repos
+            total += len(page_repos)
+            
+            # 与REST接口保持一致，最多1000条记录
+            page_info = starred.get("pageInfo") or {}
+            if not page_info.get("hasNextPage") or total >= 1000:
+                return
+            variables["after"] = page_info.get("endCursor")
+    
+    def get_starred_repos(self, username: str = None, per_page: int = 100,
+                          fields: Sequence[str] = STARRED_REPO_FIELDS) -> List[Dict]:
+        """获取用户的starred repositories"""
+        repos = []
+        for page_repos in self.get_starred_repos_stream(username, per_page, fields):
+            repos.extend(page_repos)
         return repos
     
-    def get_user_lists(self) -> List[Dict]:
-        """获取用户的star lists"""
+    def get_user_lists_stream(self, per_page: int = 100) -> Iterator[List[Dict]]:
+        """逐页获取用户的star lists，每次yield一页
+        
+        与get_starred_repos_stream相同，第一页的rel="last"给出总页数后并发获取其余页面，
+        按页码顺序yield；每页都使用带ETag的条件请求
+        """
+        endpoint = "user/starred/lists"
         try:
-            return self._make_request("GET", "user/starred/lists")
+            lists, links = self._make_request("GET", endpoint, params={"per_page": per_page},
+                                              conditional=True, with_links=True)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 # Star lists功能可能还没有完全推出
                 logging.warning("Star lists API not available, returning empty list")
-                return []
+                return
             raise
+        if not lists:
+            return
+        yield lists
+        if len(lists) < per_page:
+            return
+        
+        def fetch_page(page: int) -> List[Dict]:
+            return self._make_request("GET", endpoint, params={"per_page": per_page, "page": page},
+                                      conditional=True) or []
+        
+        yield from _fetch_remaining_pages(fetch_page, _last_page(links), per_page)
+    
+    def get_user_lists(self) -> List[Dict]:
+        """获取用户的star lists"""
+        lists = []
+        for page_lists in self.get_user_lists_stream():
+            lists.extend(page_lists)
+        return lists
     
     def create_star_list(self, name: str, description: str = "") -> Dict:
         """创建新的star list"""
@@ -89,39 +294,111 @@ class GitHubClient:
         
         return self._make_request("PATCH", f"user/starred/lists/{list_id}", data=data)
     
-    def add_repos_to_list(self, list_id: str, repo_ids: List[int]) -> Dict:
-        """将repositories添加到star list"""
-        data = {"starred_repository_ids": repo_ids}
-        return self._make_request("PUT", f"user/starred/lists/{list_id}/items", data=data)
+    def add_repos_to_list(self, list_id: str, repo_ids: List[int]) -> List[Dict]:
+        """将repositories添加到star list，返回每个分块请求的响应"""
+        return self._send_list_items("PUT", list_id, repo_ids)
+    
+    def _send_list_items(self, method: str, list_id: str, repo_ids: List[int]) -> List[Dict]:
+        """按LIST_ITEMS_CHUNK_SIZE分块发送star list items请求，多个分块并发执行"""
+        endpoint = f"user/starred/lists/{list_id}/items"
+        chunks = [repo_ids[i:i + LIST_ITEMS_CHUNK_SIZE]
+                  for i in range(0, len(repo_ids), LIST_ITEMS_CHUNK_SIZE)]
+        if len(chunks) <= 1:
+            return [self._make_request(method, endpoint, data={"starred_repository_ids": chunk})
+                    for chunk in chunks]
+        
+        with ThreadPoolExecutor(max_workers=min(STARRED_PAGE_WORKERS, len(chunks))) as executor:
+            return list(executor.map(
+                lambda chunk: self._make_request(method, endpoint, data={"starred_repository_ids": chunk}),
+                chunks
+            ))
+    
+    def get_list_repo_ids(self, list_id: str, per_page: int = 100) -> Set[int]:
+        """获取star list中已有repositories的id"""
+        repo_ids = set()
+        page = 1
+        while True:
+            items = self._make_request("GET", f"user/starred/lists/{list_id}/items",
+                                       params={"per_page": per_page, "page": page},
+                                       fields=("id",), conditional=True)
+            repo_ids.update(item["id"] for item in items if "id" in item)
+            if len(items) < per_page:
+                return repo_ids
+            page += 1
     
-    def remove_repos_from_list(self, list_id: str, repo_ids: List[int]) -> Dict:
-        """从star list中移除repositories"""
-        data = {"starred_repository_ids": repo_ids}
-        return self._make_request("DELETE", f"user/starred/lists/{list_id}/items", data=data)
+    def remove_repos_from_list(self, list_id: str, repo_ids: List[int]) -> List[Dict]:
+        """从star list中移除repositories，返回每个分块请求的响应"""
+        return self._send_list_items("DELETE", list_id, repo_ids)
     
     def get_user_info(self) -> Dict:
         """获取当前认证用户信息"""
         return self._make_request("GET", "user")
 
 
-def create_github_client(token: str = None) -> GitHubClient:
-    """创建GitHub客户端实例"""
-    return GitHubClient(token)
+def _last_page(links: Dict) -> int:
+    """从Link header的rel="last"中读取总页数，没有时为1"""
+    last_url = links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+    return int(parse_qs(urlparse(last_url).query).get("page", ["1"])[0])
+
+
+def _fetch_remaining_pages(fetch_page, last_page: int, per_page: int) -> Iterator[List[Dict]]:
+    """并发获取第2页到last_page页，按页码顺序yield，遇到空页或不满一页时停止"""
+    if last_page < 2:
+        return
+    executor = ThreadPoolExecutor(max_workers=min(STARRED_PAGE_WORKERS, last_page - 1))
+    try:
+        futures = [executor.submit(fetch_page, page) for page in range(2, last_page + 1)]
+        for future in futures:
+            items = future.result()
+            if not items:
+                break
+            yield items
+            if len(items) < per_page:
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _repo_from_graphql(node: Dict) -> Dict:
+    """把GraphQL的repository节点转换成REST接口的字段名（STARRED_REPO_FIELDS）"""
+    return {
+        "id": node.get("databaseId"),
+        "name": node.get("name"),
+        "full_name": node.get("nameWithOwner"),
+        "description": node.get("description"),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "topics": [topic["topic"]["name"] for topic in (node.get("repositoryTopics") or {}).get("nodes") or []],
+        "stargazers_count": node.get("stargazerCount"),
+        "archived": node.get("isArchived"),
+        "pushed_at": node.get("pushedAt"),
+    }
+
+
+def create_github_client(token: str = None, github_concurrency: int = None) -> GitHubClient:
+    """创建GitHub客户端实例
+    
+    github_concurrency是同时更新的star list数量，每个list的items分块请求还会并发执行，
+    连接池按两者的乘积扩容
+    """
+    pool_maxsize = max(DEFAULT_POOL_MAXSIZE, (github_concurrency or 0) * STARRED_PAGE_WORKERS)
+    return GitHubClient(token, pool_maxsize=pool_maxsize)
 
 
 if __name__ == "__main__":
     # 测试GitHub客户端
     try:
-        client = create_github_client()
-        user_info = client.get_user_info()
-        print(f"Authenticated as: {user_info['login']}")
-        
-        # 获取前5个starred repos用于测试
-        starred_repos = client.get_starred_repos()
-        print(f"Found {len(starred_repos)} starred repositories")
-        
-        if starred_repos:
-            print(f"First repo: {starred_repos[0]['full_name']}")
+        with create_github_client() as client:
+            user_info = client.get_user_info()
+            print(f"Authenticated as: {user_info['login']}")
+            
+            # 获取前5个starred repos用于测试
+            starred_repos = client.get_starred_repos()
+            print(f"Found {len(starred_repos)} starred repositories")
+            
+            if starred_repos:
+                print(f"First repo: {starred_repos[0]['full_name']}")
             
     except Exception as e:
         print(f"Error testing GitHub client: {e}")
\ No newline at end of file
@@ -0,0 +1,149 @@
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import orjson
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".star-tidy", "cache")
+
+# Keys per SELECT ... IN query; SQLite before 3.32 allows at most 999 bound variables
+GET_MANY_CHUNK_SIZE = 500
+
+# Global cache instances for reuse, keyed by cache directory
+_cache_instances = {}
+
+class AnalysisCache:
+    """Disk-backed memo of repository analysis results stored in SQLite"""
+
+    def __init__(self, cache_dir: str = None):
+        cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self.path = os.path.join(cache_dir, "analysis.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return cached result for key, or None on miss"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM analysis WHERE key = ?", (key,)
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def set(self, key: str, result: Dict):
+        """Store result for key"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis (key, result) VALUES (?, ?)",
+                (key, orjson.dumps(result).decode())
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Return {key: result} for the keys that are cached
+
+        Keys are looked up GET_MANY_CHUNK_SIZE at a time to stay under SQLite's
+        bound variable limit.
+        """
+        rows = []
+        with self._lock:
+            for i in range(0, len(keys), GET_MANY_CHUNK_SIZE):
+                chunk = keys[i:i + GET_MANY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    f"SELECT key, result FROM analysis WHERE key IN ({placeholders})", chunk
+                ).fetchall())
+        return {key: orjson.loads(result) for key, result in rows}
+
+    def set_many(self, items: Dict[str, Dict]):
+        """Store several results in a single transaction"""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO analysis (key, result) VALUES (?, ?)",
+                [(key, orjson.dumps(result).decode()) for key, result in items.items()]
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def make_analysis_key(repo_info: Dict, existing_categories: List[str],
+                      mode: str, model: str) -> str:
+    """Build a stable hash of every input that affects a repository's classification
+
+    ``pushed_at`` is part of the key, so a repository that received new commits
+    is analyzed again instead of being served a stale result.
+    """
+    payload = {
+        "full_name": repo_info.get("full_name"),
+        "description": repo_info.get("description"),
+        "topics": sorted(repo_info.get("topics") or []),
+        "language": repo_info.get("language"),
+        "pushed_at": repo_info.get("pushed_at"),
+        "categories": sorted(existing_categories or []),
+        "mode": mode,
+        "model": model,
+    }
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def make_description_key(kind: str, category: str, inputs: Dict, model: str) -> str:
+    """Build a stable hash for an AI-generated star list description
+
+    ``kind`` separates new descriptions ("summary") from enhanced ones
+    ("enhance"); ``inputs`` holds whatever the prompt was built from.
+    """
+    payload = {"kind": kind, "category": category, "inputs": inputs, "model": model}
+    return hashlib.blake2b(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def get_analysis_cache(config: Dict = None) -> Optional[AnalysisCache]:
+    """Get the shared analysis cache, or None when caching is disabled or unavailable"""
+    config = config or {}
+    if not config.get("use_cache", True):
+        return None
+
+    cache_dir = config.get("cache_dir") or DEFAULT_CACHE_DIR
+    if cache_dir in _cache_instances:
+        return _cache_instances[cache_dir]
+
+    try:
+        cache = AnalysisCache(cache_dir)
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Analysis cache unavailable, continuing without it: {e}")
+        cache = None
+
+    _cache_instances[cache_dir] = cache
+    return cache
+
+
+if __name__ == "__main__":
+    # 测试分析结果缓存
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = AnalysisCache(tmp_dir)
+        repo = {"full_name": "facebook/react", "description": "UI library",
+                "language": "JavaScript", "topics": ["react"], "pushed_at": "2024-01-01T00:00:00Z"}
+
+        key = make_analysis_key(repo, [], "auto", "gpt-4o-mini")
+        print(f"Before set: {cache.get(key)}")
+        cache.set(key, {"category": "Frontend Frameworks", "reason": "UI library", "confidence": 0.9})
+        print(f"After set: {cache.get(key)}")
+
+        repo["pushed_at"] = "2024-02-01T00:00:00Z"
+        print(f"After new push: {cache.get(make_analysis_key(repo, [], 'auto', 'gpt-4o-mini'))}")
+        cache.close()
@@ -1,6 +1,181 @@
+import re
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from utils.call_llm import call_llm_with_config
+
+import orjson
+import yaml
+from utils.call_llm import call_llm_with_config, acall_llm_with_config
+from utils.config import DEFAULT_BATCH_SIZE, get_env
+from utils.llm_cache import get_analysis_cache, make_analysis_key
+
+# Prefer the libyaml-backed loader, which is much faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# 匹配AI响应中的代码块（```json / ```yaml 等，缺少结尾标记时取到末尾）
+_FENCE_RE = re.compile(r"```[\w-]*[ \t]*\n?(.*?)(?:```|\Z)", re.S)
+
+# 匹配AI响应中单行的 "key: value" 字段
+_FIELD_LINE_RE = re.compile(r"^(category|reason|confidence):[ \t]*(.*?)[ \t]*$")
+_RESPONSE_FIELDS = ("category", "reason", "confidence")
+
+
+def strip_code_fence(response: str) -> str:
+    """提取响应中第一个代码块的内容；没有代码块时返回整个响应"""
+    match = _FENCE_RE.search(response)
+    return (match.group(1) if match else response).strip()
+
+
+def _parse_simple_fields(text: str) -> Optional[Dict]:
+    """快速解析只包含category/reason/confidence三行的响应
+    
+    只处理普通或简单引号包裹的单行值；遇到其它YAML语法时返回None，由YAML解析器处理
+    """
+    fields = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = _FIELD_LINE_RE.match(line)
+        if not match or match.group(1) in fields:
+            return None
+        fields[match.group(1)] = match.group(2)
+    
+    if len(fields) != len(_RESPONSE_FIELDS):
+        return None
+    
+    for key, value in fields.items():
+        if not value:
+            return None
+        if value[0] in "\"'":
+            # 引号内不能再出现同种引号（转义需要YAML处理）
+            if len(value) < 2 or value[-1] != value[0] or value[0] in value[1:-1]:
+                return None
+            # 双引号内的反斜杠是转义序列（\" \n等），交给YAML解码
+            if value[0] == '"' and "\\" in value:
+                return None
+            fields[key] = value[1:-1]
+        elif value[0] in "|>&*!{[%@`" or " #" in value:
+            return None
+    
+    try:
+        fields["confidence"] = float(fields["confidence"])
+    except ValueError:
+        return None
+    return fields
+
+# 自动分类模式下推荐的常见分类
+COMMON_CATEGORIES = [
+    "Web Development",
+    "Mobile Development",
+    "Data Science & ML",
+    "DevOps & Infrastructure",
+    "UI/UX & Design",
+    "Backend & APIs",
+    "Frontend Frameworks",
+    "Database & Storage",
+    "Security & Privacy",
+    "Game Development",
+    "Programming Languages",
+    "Development Tools",
+    "Documentation & Learning",
+    "Open Source Libraries",
+    "System Programming",
+    "Cloud & Serverless",
+]
+_COMMON_CATEGORIES_BLOCK = "\n".join(f"   - {cat}" for cat in COMMON_CATEGORIES)
+
+# 要求模型返回JSON对象（OpenAI兼容接口的JSON mode）
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# 单个repository的分类提示模板，只在模块加载时构建一次
+_REPO_INFO_BLOCK = """Repository Information:
+- Name: {name}
+- Description: {description}
+- Primary Language: {language}
+- Topics: {topics}"""
+
+_AUTO_PROMPT_TEMPLATE = """
+Please analyze this GitHub repository and classify it into an appropriate category.
+
+""" + _REPO_INFO_BLOCK + """
+
+Analysis Guidelines:
+1. Consider the repository's primary purpose and technology stack
+2. Choose from these common categories or suggest a new one:
+""" + _COMMON_CATEGORIES_BLOCK + """
+
+3. If none of the above categories fit well, suggest a specific category name
+
+Please respond with a JSON object:
+{{"category": "Category Name", "reason": "Brief explanation for this categorization", "confidence": 0.9}}
+
+The confidence should be between 0.0 and 1.0, where 1.0 means very confident.
+"""
+
+_EXISTING_PROMPT_TEMPLATE = """
+Please analyze this GitHub repository and classify it into one of the existing star list categories.
+
+""" + _REPO_INFO_BLOCK + """
+
+Existing Star List Categories:
+{categories}
+
+Instructions:
+1. Choose the MOST appropriate category from the existing list above
+2. If the repository doesn't fit any existing category well, choose "Uncategorized"
+3. Provide a clear reason for your choice
+
+Please respond with a JSON object:
+{{"category": "Exact Category Name from the list above", "reason": "Brief explanation for this categorization", "confidence": 0.9}}
+
+The confidence should be between 0.0 and 1.0, where 1.0 means very confident.
+"""
+
+# 批量分类的提示模板，repository列表以JSON形式嵌入
+_BATCH_REPOS_BLOCK = """
+Please analyze these GitHub repositories and classify each one into an appropriate category.
+
+Repositories (JSON):
+{repositories}
+
+"""
+
+_BATCH_RESPONSE_BLOCK = """
+
+Respond with a JSON object of this shape, with one entry per repository:
+{{"results": [{{"full_name": "owner/repo", "category": "Category Name", "reason": "Brief explanation", "confidence": 0.9}}]}}
+
+The confidence should be between 0.0 and 1.0, where 1.0 means very confident.
+"""
+
+_BATCH_AUTO_PROMPT_TEMPLATE = _BATCH_REPOS_BLOCK + """Analysis Guidelines:
+1. Consider each repository's primary purpose and technology stack
+2. Choose from these common categories or suggest a new one:
+""" + _COMMON_CATEGORIES_BLOCK + """
+
+3. If none of the above categories fit well, suggest a specific category name""" + _BATCH_RESPONSE_BLOCK
+
+_BATCH_EXISTING_PROMPT_TEMPLATE = _BATCH_REPOS_BLOCK + """Existing Star List Categories:
+{categories}
+
+Instructions:
+1. Choose the MOST appropriate category from the existing list above for each repository
+2. If a repository doesn't fit any existing category well, choose "Uncategorized"
+3. Provide a clear reason for each choice""" + _BATCH_RESPONSE_BLOCK
+
+
+def _repo_prompt_fields(name: str, description: str, language: str, topics: List[str]) -> Dict[str, str]:
+    """提示模板中repository信息的字段"""
+    return {
+        "name": name,
+        "description": description or "No description provided",
+        "language": language or "Not specified",
+        "topics": ", ".join(topics) if topics else "None",
+    }
 
 class RepositoryAnalyzer:
     """Use AI to analyze repositories for classification"""
@@ -8,10 +183,238 @@ class RepositoryAnalyzer:
     def __init__(self, existing_categories: List[str] = None, config: Dict = None):
         self.existing_categories = existing_categories or []
         self.config = config or {}
+        self._categories_block = "\n".join(f"  - {cat}" for cat in self.existing_categories)
+        self.cache = get_analysis_cache(self.config)
+        # 进程内的结果memo，相同内容的repository（如fork）只调用一次LLM
+        self._memo: Dict[tuple, Dict] = {}
+        self._memo_lock = threading.Lock()
         
     def analyze_repository(self, repo_info: Dict, mode: str = "auto") -> Dict:
         """分析单个repository并返回分类结果"""
+        cache_key, cached = self._lookup_cache(repo_info, mode)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_prompt(repo_info, mode)
+        
+        try:
+            response = call_llm_with_config(prompt, self.config, response_format=JSON_RESPONSE_FORMAT)
+        except Exception as e:
+            return self._failed_result(repo_info, e)
+        return self._handle_ai_response(response, cache_key, self._memo_key(repo_info, mode))
+    
+    def analyze_many(self, repos: List[Dict], mode: str = "auto",
+                     max_workers: int = None) -> List[Dict]:
+        """在线程池中并发分析多个repository，按输入顺序返回分类结果
+        
+        并发数默认取配置中的llm_concurrency
+        """
+        if not repos:
+            return []
+        
+        max_workers = max_workers or self.config.get("llm_concurrency") or 8
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(repos))) as executor:
+            return list(executor.map(lambda repo: self.analyze_repository(repo, mode), repos))
+    
+    async def analyze_repository_async(self, repo_info: Dict, mode: str = "auto") -> Dict:
+        """异步分析单个repository，便于并发调用LLM"""
+        cache_key, cached = self._lookup_cache(repo_info, mode)
+        if cached is not None:
+            return cached
+        
+        prompt = self._build_prompt(repo_info, mode)
+        
+        try:
+            response = await acall_llm_with_config(prompt, self.config, response_format=JSON_RESPONSE_FORMAT)
+        except Exception as e:
+            return self._failed_result(repo_info, e)
+        return self._handle_ai_response(response, cache_key, self._memo_key(repo_info, mode))
+    
+    def analyze_batch(self, repos: List[Dict], mode: str = "auto",
+                      batch_size: int = None) -> List[Dict]:
+        """按batch_size分组，每组一次LLM调用，按输入顺序返回分类结果
+        
+        batch_size默认取配置中的batch_size
+        """
+        batch_size = batch_size or self.config.get("batch_size") or DEFAULT_BATCH_SIZE
+        results = {}
+        
+        for i in range(0, len(repos), batch_size):
+            chunk = repos[i:i + batch_size]
+            chunk_results, pending, cache_keys = self._split_cached(chunk, mode)
+            
+            if len(pending) > 1:
+                try:
+                    response = call_llm_with_config(
+                        self._build_batch_prompt(pending, mode), self.config,
+                        response_format=JSON_RESPONSE_FORMAT
+                    )
+                except Exception as e:
+                    response = None
+                    logging.warning(f"Batch analysis of {len(pending)} repositories failed, analyzing individually: {e}")
+                self._store_batch_response(response, pending, mode, cache_keys, chunk_results)
+            
+            # Fall back to single-repository calls for anything the batch missed
+            for repo in pending:
+                if repo["full_name"] not in chunk_results:
+                    chunk_results[repo["full_name"]] = self.analyze_repository(repo, mode)
+            
+            results.update(chunk_results)
+        
+        return [results[repo["full_name"]] for repo in repos]
+    
+    async def analyze_batch_async(self, repos: List[Dict], mode: str = "auto") -> Dict[str, Dict]:
+        """在一次LLM调用中分析多个repository，返回 {full_name: 分类结果}
+        
+        批量响应中缺失或无效的repository会回退到单独分析
+        """
+        results, pending, cache_keys = self._split_cached(repos, mode)
+        
+        if len(pending) > 1:
+            prompt = self._build_batch_prompt(pending, mode)
+            try:
+                response = await acall_llm_with_config(
+                    prompt, self.config, response_format=JSON_RESPONSE_FORMAT
+                )
+            except Exception as e:
+                response = None
+                logging.warning(f"Batch analysis of {len(pending)} repositories failed, analyzing individually: {e}")
+            self._store_batch_response(response, pending, mode, cache_keys, results)
+        
+        # Fall back to single-repository calls for anything the batch missed
+        for repo in pending:
+            if repo["full_name"] not in results:
+                results[repo["full_name"]] = await self.analyze_repository_async(repo, mode)
+        
+        return results
+    
+    def _split_cached(self, repos: List[Dict], mode: str):
+        """Return (cached results by full_name, repos still to analyze, cache keys by full_name)"""
+        results = {}
+        pending = []
+        cache_keys = self._cache_keys(repos, mode)
+        cached = self.cache.get_many(list(cache_keys.values())) if cache_keys else {}
+        
+        for repo in repos:
+            cache_key = cache_keys.get(repo["full_name"])
+            memoized = self._memo_get(repo, mode)
+            if memoized is not None:
+                results[repo["full_name"]] = memoized
+            elif cache_key in cached:
+                logging.debug(f"Using cached analysis for {repo['full_name']}")
+                results[repo["full_name"]] = cached[cache_key]
+            else:
+                pending.append(repo)
+        return results, pending, cache_keys
+    
+    def _store_batch_response(self, response: Optional[str], pending: List[Dict], mode: str,
+                              cache_keys: Dict[str, str], results: Dict[str, Dict]):
+        """Parse a batch response into results and cache the valid entries in one transaction"""
+        if response is None:
+            return
+        try:
+            batch_results = self._load_batch_response(response)
+        except Exception as e:
+            logging.warning(f"Failed to parse batch analysis of {len(pending)} repositories, analyzing individually: {e}")
+            return
+        
+        to_cache = {}
+        for repo in pending:
+            result = batch_results.get(repo["full_name"])
+            if result is not None:
+                results[repo["full_name"]] = result
+                self._memo_set(repo, mode, result)
+                if cache_keys:
+                    to_cache[cache_keys[repo["full_name"]]] = result
+        if to_cache:
+            self.cache.set_many(to_cache)
+    
+    def _cache_model(self) -> str:
+        """Model name that is part of every cache key"""
+        return self.config.get("ai_model") or get_env("AI_MODEL", "gpt-4o-mini")
+    
+    def _cache_keys(self, repos: List[Dict], mode: str) -> Dict[str, str]:
+        """Return {full_name: cache_key}; empty when caching is disabled"""
+        if not self.cache:
+            return {}
+        
+        model = self._cache_model()
+        return {
+            repo["full_name"]: make_analysis_key(repo, self.existing_categories, mode, model)
+            for repo in repos
+        }
+    
+    def _memo_key(self, repo_info: Dict, mode: str) -> tuple:
+        """In-process memo key: everything the prompt shows about the repository"""
+        return (
+            repo_info.get("name") or "",
+            repo_info.get("description") or "",
+            repo_info.get("language") or "",
+            tuple(sorted(repo_info.get("topics") or ())),
+            mode,
+        )
+    
+    # memo中保存结果的副本并返回副本，调用方修改某个结果不会影响共享同一条目的其他repository
+    def _memo_get(self, repo_info: Dict, mode: str) -> Optional[Dict]:
+        with self._memo_lock:
+            result = self._memo.get(self._memo_key(repo_info, mode))
+        return dict(result) if result is not None else None
+    
+    def _memo_set(self, repo_info: Dict, mode: str, result: Dict):
+        self._memo_store(self._memo_key(repo_info, mode), result)
+    
+    def _memo_store(self, memo_key: tuple, result: Dict):
+        with self._memo_lock:
+            self._memo[memo_key] = dict(result)
+    
+    def _lookup_cache(self, repo_info: Dict, mode: str):
+        """Return (cache_key, cached_result), checking the in-process memo first
+        
+        cache_key is None when the disk cache is disabled or the memo already had the result
+        """
+        memoized = self._memo_get(repo_info, mode)
+        if memoized is not None:
+            return None, memoized
+        
+        if not self.cache:
+            return None, None
+        
+        cache_key = make_analysis_key(repo_info, self.existing_categories, mode, self._cache_model())
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logging.debug(f"Using cached analysis for {repo_info.get('full_name')}")
+        return cache_key, cached
+    
+    def _handle_ai_response(self, response: str, cache_key: Optional[str],
+                            memo_key: Optional[tuple] = None) -> Dict:
+        """Parse the AI response, caching it only when parsing succeeded"""
+        try:
+            result = self._load_ai_response(response)
+        except Exception as e:
+            logging.error(f"Failed to parse AI response: {e}")
+            return {
+                "category": "Uncategorized",
+                "reason": f"Failed to parse AI response: {str(e)}",
+                "confidence": 0.1
+            }
         
+        if memo_key is not None:
+            self._memo_store(memo_key, result)
+        if cache_key:
+            self.cache.set(cache_key, result)
+        return result
+    
+    def _failed_result(self, repo_info: Dict, error: Exception) -> Dict:
+        """Build the fallback result for a failed analysis"""
+        logging.error(f"Failed to analyze repository {repo_info.get('name', '')}: {error}")
+        return {
+            "category": "Uncategorized",
+            "reason": f"Analysis failed: {str(error)}",
+            "confidence": 0.1
+        }
+    
+    def _build_prompt(self, repo_info: Dict, mode: str) -> str:
+        """根据模式构建分析提示"""
         # 提取repository信息
         name = repo_info.get("name", "")
         description = repo_info.get("description", "")
@@ -29,135 +432,91 @@ class RepositoryAnalyzer:
                 name, description, language, topics, readme_content
             )
         
-        try:
-            response = call_llm_with_config(prompt, self.config)
-            return self._parse_ai_response(response)
-        except Exception as e:
-            logging.error(f"Failed to analyze repository {name}: {e}")
-            return {
-                "category": "Uncategorized",
-                "reason": f"Analysis failed: {str(e)}",
-                "confidence": 0.1
-            }
+        return prompt
     
     def _build_auto_categorization_prompt(self, name: str, description: str, 
                                         language: str, topics: List[str], 
                                         readme: str = "") -> str:
         """构建自动分类的提示"""
-        
-        prompt = f"""
-Please analyze this GitHub repository and classify it into an appropriate category.
-
-Repository Information:
-- Name: {name}
-- Description: {description or "No description provided"}
-- Primary Language: {language or "Not specified"}
-- Topics: {', '.join(topics) if topics else "None"}
-
-Analysis Guidelines:
-1. Consider the repository's primary purpose and technology stack
-2. Choose from these common categories or suggest a new one:
-   - Web Development
-   - Mobile Development  
-   - Data Science & ML
-   - DevOps & Infrastructure
-   - UI/UX & Design
-   - Backend & APIs
-   - Frontend Frameworks
-   - Database & Storage
-   - Security & Privacy
-   - Game Development
-   - Programming Languages
-   - Development Tools
-   - Documentation & Learning
-   - Open Source Libraries
-   - System Programming
-   - Cloud & Serverless
-
-3. If none of the above categories fit well, suggest a specific category name
-
-Please respond in YAML format:
-```yaml
-category: "Category Name"
-reason: "Brief explanation for this categorization"
-confidence: 0.9
-```
-
-The confidence should be between 0.0 and 1.0, where 1.0 means very confident.
-"""
-        return prompt
+        return _AUTO_PROMPT_TEMPLATE.format(**_repo_prompt_fields(name, description, language, topics))
     
     def _build_existing_categories_prompt(self, name: str, description: str,
                                         language: str, topics: List[str],
                                         readme: str = "") -> str:
         """构建基于已有分类的提示"""
+        return _EXISTING_PROMPT_TEMPLATE.format(
+            categories=self._categories_block,
+            **_repo_prompt_fields(name, description, language, topics)
+        )
+    
+    def _build_batch_prompt(self, repos: List[Dict], mode: str) -> str:
+        """构建批量分类的提示"""
+        repo_summaries = orjson.dumps([
+            {
+                "full_name": repo.get("full_name", ""),
+                "description": repo.get("description") or "",
+                "language": repo.get("language") or "",
+                "topics": repo.get("topics") or []
+            }
+            for repo in repos
+        ]).decode()
         
-        categories_list = '\n'.join([f"  - {cat}" for cat in self.existing_categories])
+        if mode == "existing_lists" and self.existing_categories:
+            return _BATCH_EXISTING_PROMPT_TEMPLATE.format(
+                repositories=repo_summaries, categories=self._categories_block
+            )
+        return _BATCH_AUTO_PROMPT_TEMPLATE.format(repositories=repo_summaries)
+    
+    def _load_batch_response(self, response: str) -> Dict[str, Dict]:
+        """解析批量分类的JSON响应，返回 {full_name: 分类结果}，跳过无效条目"""
+        data = orjson.loads(strip_code_fence(response))
+        entries = data.get("results", []) if isinstance(data, dict) else data
         
-        prompt = f"""
-Please analyze this GitHub repository and classify it into one of the existing star list categories.
-
-Repository Information:
-- Name: {name}
-- Description: {description or "No description provided"}
-- Primary Language: {language or "Not specified"}
-- Topics: {', '.join(topics) if topics else "None"}
-
-Existing Star List Categories:
-{categories_list}
-
-Instructions:
-1. Choose the MOST appropriate category from the existing list above
-2. If the repository doesn't fit any existing category well, choose "Uncategorized"
-3. Provide a clear reason for your choice
-
-Please respond in YAML format:
-```yaml
-category: "Exact Category Name from the list above"
-reason: "Brief explanation for this categorization"
-confidence: 0.9
-```
-
-The confidence should be between 0.0 and 1.0, where 1.0 means very confident.
-"""
-        return prompt
+        results = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or "full_name" not in entry:
+                continue
+            try:
+                results[entry["full_name"]] = self._normalize_result(entry)
+            except (TypeError, ValueError) as e:
+                logging.debug(f"Skipping invalid batch entry for {entry['full_name']}: {e}")
+        return results
     
     def _parse_ai_response(self, response: str) -> Dict:
         """解析AI的响应"""
+        return self._handle_ai_response(response, None)
+    
+    def _load_ai_response(self, response: str) -> Dict:
+        """解析AI的响应，解析失败时抛出异常
+        
+        提示要求返回JSON；不遵循JSON mode的模型可能仍返回YAML，此时回退到YAML解析
+        """
+        yaml_part = strip_code_fence(response)
+        
         try:
-            import yaml
-            
-            # 提取YAML部分
-            if "```yaml" in response:
-                yaml_part = response.split("```yaml")[1].split("```")[0].strip()
-            elif "```" in response:
-                yaml_part = response.split("```")[1].split("```")[0].strip()
-            else:
-                yaml_part = response.strip()
-            
-            result = yaml.safe_load(yaml_part)
-            
-            # 验证必需字段
-            if not isinstance(result, dict):
-                raise ValueError("Response is not a valid dictionary")
-            
-            if "category" not in result:
-                raise ValueError("Missing 'category' field")
-            
-            # 设置默认值
-            return {
-                "category": result["category"],
-                "reason": result.get("reason", "No reason provided"),
-                "confidence": float(result.get("confidence", 0.5))
-            }
-            
-        except Exception as e:
-            logging.error(f"Failed to parse AI response: {e}")
-            return {
-                "category": "Uncategorized",
-                "reason": f"Failed to parse AI response: {str(e)}",
-                "confidence": 0.1
-            }
+            result = orjson.loads(yaml_part)
+        except orjson.JSONDecodeError:
+            # 常见的三行响应无需完整的YAML解析
+            result = _parse_simple_fields(yaml_part)
+            if result is None:
+                result = yaml.load(yaml_part, Loader=_SafeLoader)
+        return self._normalize_result(result)
+    
+    def _normalize_result(self, result: Dict) -> Dict:
+        """验证AI返回的分类结果并补全默认值"""
+        # 验证必需字段
+        if not isinstance(result, dict):
+            raise ValueError("Response is not a valid dictionary")
+        
+        if "category" not in result:
+            raise ValueError("Missing 'category' field")
+        
+        # 设置默认值
+        return {
+            "category": result["category"],
+            "reason": result.get("reason", "No reason provided"),
+            "confidence": float(result.get("confidence", 0.5))
+        }
 
 
 def analyze_repository(repo_info: Dict, existing_categories: List[str] = None, 
@@ -167,6 +526,35 @@ def analyze_repository(repo_info: Dict, existing_categories: List[str] = None,
     return analyzer.analyze_repository(repo_info, mode)
 
 
+def analyze_repositories(repos: List[Dict], existing_categories: List[str] = None,
+                         mode: str = "auto", config: Dict = None,
+                         max_workers: int = None) -> List[Dict]:
+    """Convenience function to analyze several repositories concurrently"""
+    analyzer = RepositoryAnalyzer(existing_categories, config)
+    return analyzer.analyze_many(repos, mode, max_workers)
+
+
+async def analyze_repository_async(repo_info: Dict, existing_categories: List[str] = None,
+                                   mode: str = "auto", config: Dict = None) -> Dict:
+    """Convenience coroutine to analyze repository"""
+    analyzer = RepositoryAnalyzer(existing_categories, config)
+    return await analyzer.analyze_repository_async(repo_info, mode)
+
+
+def analyze_batch(repos: List[Dict], existing_categories: List[str] = None,
+                  mode: str = "auto", config: Dict = None, batch_size: int = None) -> List[Dict]:
+    """Convenience function to analyze repositories in batched LLM calls"""
+    analyzer = RepositoryAnalyzer(existing_categories, config)
+    return analyzer.analyze_batch(repos, mode, batch_size)
+
+
+async def analyze_batch_async(repos: List[Dict], existing_categories: List[str] = None,
+                              mode: str = "auto", config: Dict = None) -> Dict[str, Dict]:
+    """Convenience coroutine to analyze several repositories in one LLM call"""
+    analyzer = RepositoryAnalyzer(existing_categories, config)
+    return await analyzer.analyze_batch_async(repos, mode)
+
+
 if __name__ == "__main__":
     # 测试repository分析
     test_repo = {
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+# Repositories not pushed to for this long count as stale
+STALE_AFTER = timedelta(days=3 * 365)
+
+# High-signal GitHub topics that map 1:1 onto one of the common categories
+TOPIC_MAP: Dict[str, str] = {
+    "react": "Frontend Frameworks",
+    "vue": "Frontend Frameworks",
+    "angular": "Frontend Frameworks",
+    "svelte": "Frontend Frameworks",
+    "machine-learning": "Data Science & ML",
+    "deep-learning": "Data Science & ML",
+    "pytorch": "Data Science & ML",
+    "tensorflow": "Data Science & ML",
+    "data-science": "Data Science & ML",
+    "kubernetes": "DevOps & Infrastructure",
+    "docker": "DevOps & Infrastructure",
+    "terraform": "DevOps & Infrastructure",
+    "devops": "DevOps & Infrastructure",
+    "android": "Mobile Development",
+    "ios": "Mobile Development",
+    "flutter": "Mobile Development",
+    "react-native": "Mobile Development",
+    "database": "Database & Storage",
+    "postgresql": "Database & Storage",
+    "security": "Security & Privacy",
+    "cryptography": "Security & Privacy",
+    "privacy": "Security & Privacy",
+    "gamedev": "Game Development",
+    "game-engine": "Game Development",
+    "serverless": "Cloud & Serverless",
+    "programming-language": "Programming Languages",
+    "compiler": "Programming Languages",
+}
+
+_SYSTEMS_LANGUAGES = frozenset({"Rust", "C", "C++"})
+_OS_TOPICS = frozenset({"os", "operating-system", "kernel"})
+
+
+def _topics(repo: Dict) -> List[str]:
+    return repo.get("topics") or []
+
+
+def _is_awesome_list(repo: Dict) -> bool:
+    return any(topic == "awesome" or topic == "awesome-list" for topic in _topics(repo))
+
+
+def _is_paper(repo: Dict) -> bool:
+    return repo.get("language") == "TeX"
+
+
+def _is_os_project(repo: Dict) -> bool:
+    return repo.get("language") in _SYSTEMS_LANGUAGES and not _OS_TOPICS.isdisjoint(_topics(repo))
+
+
+def _is_stale_archive(repo: Dict) -> bool:
+    if not repo.get("archived"):
+        return False
+
+    pushed_at = repo.get("pushed_at")
+    if not pushed_at:
+        return False
+    try:
+        pushed = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return datetime.now(timezone.utc) - pushed > STALE_AFTER
+
+
+# (predicate, category, confidence, reason), checked in order
+RULES: List[Tuple[Callable[[Dict], bool], str, float, str]] = [
+    (_is_stale_archive, "Archived", 0.9, "Archived repository with no pushes in over 3 years"),
+    (_is_awesome_list, "Awesome Lists", 0.95, "Tagged with the 'awesome' topic"),
+    (_is_paper, "Papers/Research", 0.9, "Written in TeX"),
+    (_is_os_project, "System Programming", 0.9, "Operating system project in a systems language"),
+]
+
+
+def build_topic_map(overrides: Dict[str, Optional[str]] = None) -> Dict[str, str]:
+    """Merge user overrides into TOPIC_MAP; an empty category removes a topic"""
+    topic_map = {**TOPIC_MAP, **(overrides or {})}
+    return {topic: category for topic, category in topic_map.items() if category}
+
+
+def _classify_by_topics(repo: Dict, topic_map: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """Return (category, topic) when the mapped topics agree on one category"""
+    matches = {}
+    for topic in _topics(repo):
+        category = topic_map.get(topic)
+        if category:
+            matches.setdefault(category, topic)
+    # Topics pointing at different categories (e.g. react + react-native) need the LLM
+    if len(matches) != 1:
+        return None
+    return next(iter(matches.items()))
+
+
+def classify_by_rules(repo: Dict, existing_categories: Collection[str] = None,
+                      mode: str = "auto", topic_map: Dict[str, str] = None) -> Optional[Dict]:
+    """Classify a repository without the LLM when a high-confidence rule matches
+
+    In existing_lists mode only rules whose category is one of the existing
+    categories may fire; pass a set when classifying many repositories.
+    ``topic_map`` defaults to TOPIC_MAP; see build_topic_map for overrides.
+    Returns None when no rule applies.
+    """
+    for predicate, category, confidence, reason in RULES:
+        if mode == "existing_lists" and category not in (existing_categories or ()):
+            continue
+        if predicate(repo):
+            return {
+                "category": category,
+                "reason": f"Rule-based: {reason}",
+                "confidence": confidence
+            }
+
+    match = _classify_by_topics(repo, TOPIC_MAP if topic_map is None else topic_map)
+    if match:
+        category, topic = match
+        if mode != "existing_lists" or category in (existing_categories or ()):
+            return {
+                "category": category,
+                "reason": f"Rule-based: matched topic '{topic}'",
+                "confidence": 0.95
+            }
+    return None
+
+
+if __name__ == "__main__":
+    # 测试规则分类
+    test_repos = [
+        {"full_name": "sindresorhus/awesome", "topics": ["awesome", "lists"], "language": None},
+        {"full_name": "user/thesis", "topics": [], "language": "TeX"},
+        {"full_name": "old/project", "topics": [], "language": "C", "archived": True,
+         "pushed_at": "2015-01-01T00:00:00Z"},
+        {"full_name": "facebook/react", "topics": ["react"], "language": "JavaScript"},
+        {"full_name": "facebook/react-native", "topics": ["react", "react-native"], "language": "C++"},
+        {"full_name": "torvalds/linux", "topics": ["kernel"], "language": "C"},
+        {"full_name": "user/app", "topics": ["cli"], "language": "Go"},
+    ]
+
+    for repo in test_repos:
+        result = classify_by_rules(repo)
+        print(f"{repo['full_name']}: {result['category'] if result else 'needs LLM'}")
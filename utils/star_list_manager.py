@@ -1,7 +1,103 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import orjson
 from utils.github_client import GitHubClient
-from utils.call_llm import call_llm_with_config
+from utils.call_llm import call_llm_with_config, acall_llm_with_config
+from utils.config import get_env
+from utils.llm_cache import get_analysis_cache, make_description_key
+from utils.repo_analyzer import strip_code_fence
+
+# Number of sample repositories shown to the AI per category
+SUMMARY_SAMPLE_SIZE = 5
+# Per-sample limits that keep summary prompts short
+SAMPLE_DESCRIPTION_CHARS = 120
+SAMPLE_TOPICS = 5
+
+_get_full_name = itemgetter("full_name")
+
+# Batched summaries are requested as JSON (OpenAI-compatible JSON mode)
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Part of every description cache key; bump when the summary prompts change
+SUMMARY_PROMPT_VERSION = 3
+
+# Summary prompt templates, built once at import; JSON braces are escaped for str.format.
+# The fixed instructions come first and the per-list data last, so repeated calls
+# share a long identical prefix that providers can serve from their prompt cache.
+_DESCRIPTION_RULES_BLOCK = """You write descriptions for GitHub star lists.
+
+Each description should:
+1. Explain what the category contains
+2. Highlight the main technologies/languages
+3. Mention the purpose or use case
+4. Stay under 100 words
+5. Sound professional and helpful"""
+
+_SUMMARY_PROMPT_TEMPLATE = _DESCRIPTION_RULES_BLOCK + """
+
+Create a concise and informative description for the star list below.
+Respond with the description only.
+
+Star list: "{category}"
+Total repositories in this category: {count}
+Repository samples from this category (JSON):
+{samples}
+
+Description:"""
+
+_BATCH_SUMMARY_PROMPT_TEMPLATE = _DESCRIPTION_RULES_BLOCK + """
+
+Create a concise and informative description for each of the star lists below.
+Respond with a JSON object mapping every category name exactly as given to its description:
+{{"descriptions": {{"Category Name": "Description"}}}}
+
+Star lists with repository samples (JSON):
+{lists}
+"""
+
+_ENHANCE_PROMPT_TEMPLATE = """Enhance this existing GitHub star list description with updated information.
+
+Enhance the description by:
+1. Keeping the original tone and style
+2. Adding relevant statistics if missing
+3. Updating outdated information
+4. Ensuring accuracy and completeness
+5. Keeping it concise and professional
+
+Respond with the enhanced description only.
+
+Category: {category}
+Repository count: {count}
+Repository statistics (JSON): {stats}
+Current description: "{existing_desc}"
+
+Enhanced description:"""
+
+@dataclass
+class ListEntry:
+    """A star list tracked by StarListManager
+    
+    ``repo_ids`` stays None until the list's membership has been fetched.
+    """
+    # Declared by hand (dataclass(slots=True) needs Python 3.10), so fields take no defaults
+    __slots__ = ("id", "name", "description", "repo_ids")
+    id: int
+    name: str
+    description: str
+    repo_ids: Optional[Set[int]]
+    
+    @classmethod
+    def from_api(cls, data: Dict) -> "ListEntry":
+        """Build an entry from a star list object returned by the GitHub API"""
+        return cls(data["id"], data["name"], data.get("description") or "", None)
+
 
 class StarListManager:
     """Manage GitHub star lists creation, updates, and maintenance"""
@@ -9,7 +105,12 @@ class StarListManager:
     def __init__(self, github_client: GitHubClient, config: Dict = None):
         self.github_client = github_client
         self.config = config or {}
-        self._list_cache = {}
+        self._list_cache: Dict[str, ListEntry] = {}
+        # Per-run memos keyed by the repository set, see _repo_set_key
+        self._stats_cache: Dict[Tuple, Dict] = {}
+        self._basic_description_cache: Dict[Tuple, str] = {}
+        # AI descriptions persist across runs in the analysis cache
+        self.cache = get_analysis_cache(self.config)
         self.summary_options = {
             "auto_complete": True,  # Auto-complete missing descriptions
             "enhance_existing": True,  # Enhance existing descriptions
@@ -18,10 +119,18 @@ class StarListManager:
         }
     
     def get_existing_lists(self) -> List[Dict]:
-        """Get existing star lists"""
+        """Get existing star lists
+        
+        Pages are consumed as they arrive, so the name lookup is built while
+        the remaining pages are still being fetched.
+        """
         try:
-            lists = self.github_client.get_user_lists()
-            self._list_cache = {lst["name"]: lst for lst in lists}
+            lists = []
+            lists_by_name = {}
+            for page_lists in self.github_client.get_user_lists_stream():
+                lists.extend(page_lists)
+                lists_by_name.update((lst["name"], ListEntry.from_api(lst)) for lst in page_lists)
+            self._list_cache = lists_by_name
             return lists
         except Exception as e:
             logging.warning(f"Failed to fetch existing star lists: {e}")
@@ -57,12 +166,12 @@ class StarListManager:
             list_id = new_list["id"]
             
             # Add repositories
-            if repos_to_add:
-                repo_ids = [repo["id"] for repo in repos_to_add]
+            repo_ids = [repo["id"] for repo in repos_to_add]
+            if repo_ids:
                 self.github_client.add_repos_to_list(list_id, repo_ids)
             
-            # Update cache
-            self._list_cache[list_name] = new_list
+            # Update cache; the new list holds exactly the repositories just added
+            self._list_cache[list_name] = ListEntry(list_id, list_name, description, set(repo_ids))
             
             logging.info(f"Created new star list '{list_name}' with {len(repos_to_add)} repositories")
             
@@ -77,24 +186,25 @@ class StarListManager:
             logging.error(f"Failed to create list '{list_name}': {e}")
             raise
     
-    def _update_existing_list(self, existing_list: Dict, description: str,
+    def _update_existing_list(self, existing_list: ListEntry, description: str,
                             repos_to_add: List[Dict]) -> Dict:
         """Update existing star list"""
         try:
-            list_id = existing_list["id"]
-            list_name = existing_list["name"]
+            list_id = existing_list.id
+            list_name = existing_list.name
             
             # Update description (if provided)
-            if description and description != existing_list.get("description", ""):
+            if description and description != existing_list.description:
                 self.github_client.update_star_list(list_id, description=description)
             
-            # Add new repositories
+            # Add only repositories that are not in the list yet
             repos_added = 0
             if repos_to_add:
-                # Get current repo IDs in list (simplified handling, may need API call in practice)
-                repo_ids_to_add = [repo["id"] for repo in repos_to_add]
+                existing_ids = self._get_list_repo_ids(existing_list)
+                repo_ids_to_add = [repo["id"] for repo in repos_to_add if repo["id"] not in existing_ids]
                 if repo_ids_to_add:
                     self.github_client.add_repos_to_list(list_id, repo_ids_to_add)
+                    existing_ids.update(repo_ids_to_add)
                     repos_added = len(repo_ids_to_add)
             
             logging.info(f"Updated star list '{list_name}' with {repos_added} repositories")
@@ -107,57 +217,107 @@ class StarListManager:
             }
             
         except Exception as e:
-            logging.error(f"Failed to update list '{existing_list['name']}': {e}")
+            logging.error(f"Failed to update list '{existing_list.name}': {e}")
             raise
     
+    def _get_list_repo_ids(self, existing_list: ListEntry) -> Set[int]:
+        """Return the repository ids already in a list, cached on the list entry"""
+        if existing_list.repo_ids is None:
+            try:
+                existing_list.repo_ids = self.github_client.get_list_repo_ids(existing_list.id)
+            except Exception as e:
+                # Without the membership, fall back to sending every repository
+                logging.warning(f"Failed to fetch repositories of list '{existing_list.name}': {e}")
+                return set()
+        return existing_list.repo_ids
+    
     def organize_repos_by_category(self, classification_results: Dict[str, Dict],
-                                 starred_repos: List[Dict]) -> Dict[str, List[Dict]]:
-        """Organize repositories by classification results"""
-        organized = {}
+                                 starred_repos: List[Dict] = None,
+                                 repo_by_name: Dict[str, Dict] = None) -> Dict[str, List[Dict]]:
+        """Organize repositories by classification results
+        
+        Pass ``repo_by_name`` (full_name -> repo) when the caller already has it,
+        otherwise it is built from ``starred_repos``.
+        """
+        organized = defaultdict(list)
         
         # Create repo lookup mapping
-        repo_map = {repo["full_name"]: repo for repo in starred_repos}
+        if repo_by_name is None:
+            repo_by_name = {repo["full_name"]: repo for repo in starred_repos or []}
         
         for repo_full_name, classification in classification_results.items():
-            category = classification["category"]
-            repo = repo_map.get(repo_full_name)
-            
+            repo = repo_by_name.get(repo_full_name)
             if repo:
-                if category not in organized:
-                    organized[category] = []
-                organized[category].append(repo)
+                organized[classification["category"]].append(repo)
         
-        return organized
+        return dict(organized)
     
     def execute_batch_operations(self, organized_repos: Dict[str, List[Dict]],
-                               dry_run: bool = False) -> Dict[str, Dict]:
-        """Execute batch star list operations"""
+                               dry_run: bool = False, include_repo_names: bool = True,
+                               descriptions: Optional[Dict[str, str]] = None) -> Dict[str, Dict]:
+        """Execute batch star list operations
+        
+        All operations are collected first and then applied together, with
+        different lists updated concurrently (see apply_list_operations).
+        ``descriptions`` maps categories to the list descriptions to write; when
+        omitted they are generated with complete_list_summaries (skipped in
+        dry-run mode). Dry-run results list each category's repository names
+        unless ``include_repo_names`` is False, in which case only counts are
+        reported.
+        """
         results = {}
         
+        if descriptions is None:
+            # Generate descriptions for all categories up front, batched into one AI call
+            descriptions = {} if dry_run else self.complete_list_summaries(
+                self._list_cache, organized_repos
+            )
+        
+        operations = []
         for category, repos in organized_repos.items():
             if not repos:
                 continue
             
-            try:
-                if dry_run:
-                    results[category] = {
-                        "success": True,
-                        "action": "dry_run",
-                        "repos_count": len(repos),
-                        "repos": [repo["full_name"] for repo in repos]
-                    }
-                    logging.info(f"DRY RUN: Would create/update list '{category}' with {len(repos)} repos")
-                else:
-                    # Generate appropriate description
-                    description = self._generate_list_description(category, repos)
-                    result = self.create_or_update_list(category, description, repos)
-                    results[category] = result
-                    
-            except Exception as e:
-                logging.error(f"Failed to process category '{category}': {e}")
-                results[category] = {"success": False, "error": str(e)}
+            description = descriptions.get(category, "")
+            if dry_run:
+                results[category] = {
+                    "success": True,
+                    "action": "dry_run",
+                    "repos_count": len(repos),
+                    "enhanced_description": description
+                }
+                if include_repo_names:
+                    results[category]["repos"] = list(map(_get_full_name, repos))
+                logging.info(f"DRY RUN: Would create/update list '{category}' with {len(repos)} repos")
+                logging.info(f"Enhanced description: {description}")
+            else:
+                operations.append((category, description, repos))
+        
+        for category, result in self.apply_list_operations(operations).items():
+            result["enhanced_description"] = descriptions.get(category, "")
+            results[category] = result
+        
+        # Keep the results in category order regardless of completion order
+        return {category: results[category] for category in organized_repos if category in results}
+    
+    def apply_list_operations(self, operations: List[Tuple[str, str, List[Dict]]]) -> Dict[str, Dict]:
+        """Create or update several star lists, returning {list_name: result}
+        
+        Each operation is (list_name, description, repos_to_add). Requests for
+        one list stay sequential (a new list's id is needed before adding
+        repositories), while different lists are processed concurrently over
+        the GitHub client's pooled session, bounded by ``github_concurrency``.
+        """
+        if not operations:
+            return {}
         
-        return results
+        max_workers = min(self.config.get("github_concurrency") or 4, len(operations))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                list_name: executor.submit(self.create_or_update_list, list_name, description, repos)
+                for list_name, description, repos in operations
+            }
+        return {list_name: future.result() for list_name, future in futures.items()}
     
     def set_summary_options(self, **options):
         """Set summary completion options"""
@@ -165,159 +325,424 @@ class StarListManager:
     
     def generate_ai_summary(self, category: str, repos: List[Dict]) -> str:
         """Generate AI-powered summary for a star list"""
-        if not self.summary_options.get("use_ai_summary", True):
-            return self._generate_basic_description(category, repos)
-        
-        # Prepare repository information for AI
-        repo_info = []
-        for repo in repos[:5]:  # Use top 5 repos for analysis
-            info = {
-                "name": repo.get("name", ""),
-                "description": repo.get("description", ""),
-                "language": repo.get("language", ""),
-                "topics": repo.get("topics", []),
-                "stars": repo.get("stargazers_count", 0)
-            }
-            repo_info.append(info)
+        description, cache_key = self._summary_lookup(category, repos)
+        if description:
+            return description
         
-        prompt = f"""
-Create a concise and informative description for a GitHub star list named "{category}".
-
-Repository samples from this category:
-{repo_info}
-
-Total repositories in this category: {len(repos)}
-
-Generate a description that:
-1. Explains what this category contains
-2. Highlights the main technologies/languages
-3. Mentions the purpose or use case
-4. Keeps it under 100 words
-5. Sounds professional and helpful
-
-Description:"""
+        try:
+            ai_description = call_llm_with_config(self._summary_prompt(category, repos), self.config)
+            return self._store_description(cache_key, ai_description.strip(), category, repos)
+        except Exception as e:
+            return self._summary_failed(category, repos, e)
+    
+    async def agenerate_ai_summary(self, category: str, repos: List[Dict]) -> str:
+        """Async version of generate_ai_summary"""
+        description, cache_key = self._summary_lookup(category, repos)
+        if description:
+            return description
         
         try:
-            ai_description = call_llm_with_config(prompt, self.config)
-            return ai_description.strip()
+            ai_description = await acall_llm_with_config(self._summary_prompt(category, repos), self.config)
+            return self._store_description(cache_key, ai_description.strip(), category, repos)
         except Exception as e:
-            logging.warning(f"Failed to generate AI summary for {category}: {e}")
-            return self._generate_basic_description(category, repos)
+            return self._summary_failed(category, repos, e)
+    
+    def generate_ai_summaries_batch(self, categories: Dict[str, List[Dict]],
+                                    semaphore: Optional[threading.Semaphore] = None) -> Dict[str, str]:
+        """Generate summaries for several star lists in a single AI call
+        
+        Cached descriptions are reused and only the remaining categories are
+        sent; categories missing from the AI response fall back to
+        generate_ai_summary, run concurrently on a thread pool. Every AI call
+        holds ``semaphore`` (by default one bounded by ``llm_concurrency``), so
+        a caller running other calls alongside can share a single limit.
+        """
+        semaphore = semaphore or threading.Semaphore(self._llm_concurrency())
+        descriptions, categories, prompt = self._batch_summary_request(categories)
+        if prompt:
+            try:
+                with semaphore:
+                    response = call_llm_with_config(prompt, self.config, response_format=_JSON_RESPONSE_FORMAT)
+                descriptions.update(self._parse_batch_summaries(response, categories))
+            except Exception as e:
+                self._batch_summary_failed(categories, e)
+        
+        def fallback(category, repos):
+            with semaphore:
+                return self.generate_ai_summary(category, repos)
+        
+        missing = self._missing_summaries(descriptions, categories)
+        if len(missing) > 1:
+            max_workers = min(self._llm_concurrency(), len(missing))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {category: executor.submit(fallback, category, repos)
+                           for category, repos in missing.items()}
+            descriptions.update({category: future.result() for category, future in futures.items()})
+        else:
+            descriptions.update({category: fallback(category, repos)
+                                 for category, repos in missing.items()})
+        return descriptions
     
-    def complete_list_summaries(self, existing_lists: List[Dict], repos_by_category: Dict[str, List[Dict]]) -> Dict[str, str]:
-        """Complete or enhance summaries for star lists"""
+    async def agenerate_ai_summaries_batch(self, categories: Dict[str, List[Dict]],
+                                           semaphore: asyncio.Semaphore) -> Dict[str, str]:
+        """Async version of generate_ai_summaries_batch; fallbacks run concurrently"""
+        descriptions, categories, prompt = self._batch_summary_request(categories)
+        if prompt:
+            try:
+                async with semaphore:
+                    response = await acall_llm_with_config(prompt, self.config, response_format=_JSON_RESPONSE_FORMAT)
+                descriptions.update(self._parse_batch_summaries(response, categories))
+            except Exception as e:
+                self._batch_summary_failed(categories, e)
+        
+        async def fallback(category, repos):
+            async with semaphore:
+                descriptions[category] = await self.agenerate_ai_summary(category, repos)
+        
+        await asyncio.gather(*(fallback(category, repos)
+                               for category, repos in self._missing_summaries(descriptions, categories).items()))
+        return descriptions
+    
+    def complete_list_summaries(self, existing_lists: Union[List[Dict], Dict[str, ListEntry]],
+                                repos_by_category: Dict[str, List[Dict]]) -> Dict[str, str]:
+        """Complete or enhance summaries for star lists
+        
+        ``existing_lists`` is a list of star lists or a {name: ListEntry}
+        mapping such as the one get_existing_lists builds. New descriptions (new
+        lists and auto-completed ones) are generated in one batched AI call,
+        which runs alongside the per-list enhancement calls on a thread pool.
+        One semaphore bounds all of these calls, including the batch's
+        individual fallbacks, by ``llm_concurrency``.
+        """
+        summaries, to_generate, to_enhance = self._plan_summaries(existing_lists, repos_by_category)
+        if not to_generate and not to_enhance:
+            return self._log_summaries(summaries, to_enhance, repos_by_category)
+        
+        llm_concurrency = self._llm_concurrency()
+        semaphore = threading.Semaphore(llm_concurrency)
+        
+        def enhance(category, existing_desc, repos):
+            with semaphore:
+                return self._enhance_existing_description(existing_desc, category, repos)
+        
+        max_workers = min(llm_concurrency, len(to_enhance) + bool(to_generate))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            enhanced = {
+                category: executor.submit(enhance, category, existing_desc, repos)
+                for category, (existing_desc, repos) in to_enhance.items()
+            }
+            generated = executor.submit(self.generate_ai_summaries_batch, to_generate, semaphore) if to_generate else None
+        
+        summaries.update({category: future.result() for category, future in enhanced.items()})
+        if generated:
+            summaries.update(generated.result())
+        
+        return self._log_summaries(summaries, to_enhance, repos_by_category)
+    
+    async def acomplete_list_summaries(self, existing_lists: Union[List[Dict], Dict[str, ListEntry]],
+                                       repos_by_category: Dict[str, List[Dict]]) -> Dict[str, str]:
+        """Async version of complete_list_summaries
+        
+        The batched generation call and the per-list enhancement calls run
+        concurrently, bounded by ``llm_concurrency``.
+        """
+        summaries, to_generate, to_enhance = self._plan_summaries(existing_lists, repos_by_category)
+        semaphore = asyncio.Semaphore(self._llm_concurrency())
+        
+        async def enhance(category, existing_desc, repos):
+            async with semaphore:
+                summaries[category] = await self._aenhance_existing_description(existing_desc, category, repos)
+        
+        async def generate():
+            summaries.update(await self.agenerate_ai_summaries_batch(to_generate, semaphore))
+        
+        tasks = [enhance(category, existing_desc, repos)
+                 for category, (existing_desc, repos) in to_enhance.items()]
+        if to_generate:
+            tasks.append(generate())
+        await asyncio.gather(*tasks)
+        
+        return self._log_summaries(summaries, to_enhance, repos_by_category)
+    
+    def _plan_summaries(self, existing_lists: Union[List[Dict], Dict[str, ListEntry]],
+                        repos_by_category: Dict[str, List[Dict]]):
+        """Split categories into (kept summaries, lists needing a new description, lists to enhance)"""
+        lists_by_name = existing_lists if isinstance(existing_lists, dict) else {
+            lst["name"]: ListEntry.from_api(lst) for lst in existing_lists
+        }
         summaries = {}
+        to_generate = {}
+        to_enhance = {}
         
         for category, repos in repos_by_category.items():
-            existing_list = next((lst for lst in existing_lists if lst["name"] == category), None)
+            existing_list = lists_by_name.get(category)
             
             if existing_list:
-                existing_desc = existing_list.get("description", "")
+                existing_desc = existing_list.description
                 
                 if not existing_desc and self.summary_options.get("auto_complete", True):
                     # Auto-complete missing description
-                    summaries[category] = self.generate_ai_summary(category, repos)
-                    logging.info(f"Auto-completed description for list: {category}")
-                
+                    to_generate[category] = repos
+                    logging.info(f"Auto-completing description for list: {category}")
                 elif existing_desc and self.summary_options.get("enhance_existing", True):
                     # Enhance existing description
-                    enhanced = self._enhance_existing_description(existing_desc, category, repos)
-                    if enhanced != existing_desc:
-                        summaries[category] = enhanced
-                        logging.info(f"Enhanced description for list: {category}")
-                    else:
-                        summaries[category] = existing_desc
+                    to_enhance[category] = (existing_desc, repos)
                 else:
                     summaries[category] = existing_desc
             else:
                 # New list - generate description
-                summaries[category] = self.generate_ai_summary(category, repos)
+                to_generate[category] = repos
         
-        return summaries
+        return summaries, to_generate, to_enhance
     
-    def _enhance_existing_description(self, existing_desc: str, category: str, repos: List[Dict]) -> str:
-        """Enhance existing description with updated information"""
+    def _log_summaries(self, summaries: Dict[str, str], to_enhance: Dict[str, Tuple[str, List[Dict]]],
+                       repos_by_category: Dict[str, List[Dict]]) -> Dict[str, str]:
+        """Log enhanced descriptions and return summaries in input category order"""
+        for category, (existing_desc, _) in to_enhance.items():
+            if summaries.get(category) != existing_desc:
+                logging.info(f"Enhanced description for list: {category}")
+        return {category: summaries[category] for category in repos_by_category if category in summaries}
+    
+    def _summary_lookup(self, category: str, repos: List[Dict]) -> Tuple[Optional[str], Optional[str]]:
+        """Return (description, cache_key); description is None only when an AI call is needed"""
         if not self.summary_options.get("use_ai_summary", True):
-            return existing_desc
+            return self._generate_basic_description(category, repos), None
+        cache_key = self._summary_cache_key(category, repos)
+        return self._cached_description(cache_key), cache_key
+    
+    def _summary_failed(self, category: str, repos: List[Dict], error: Exception) -> str:
+        logging.warning(f"Failed to generate AI summary for {category}: {error}")
+        return self._generate_basic_description(category, repos)
+    
+    def _batch_summary_request(self, categories: Dict[str, List[Dict]]):
+        """Split categories into (cached descriptions, pending categories, batch prompt)
+        
+        The prompt is None when the pending categories are not worth a batched
+        call, i.e. AI summaries are off or at most one category is left.
+        """
+        descriptions, pending = self._split_cached_summaries(categories)
+        if not self.summary_options.get("use_ai_summary", True) or len(pending) < 2:
+            return descriptions, pending, None
+        return descriptions, pending, self._batch_summary_prompt(pending)
+    
+    @staticmethod
+    def _batch_summary_failed(categories: Dict[str, List[Dict]], error: Exception):
+        logging.warning(f"Batch summary generation for {len(categories)} lists failed, generating individually: {error}")
+    
+    @staticmethod
+    def _missing_summaries(descriptions: Dict[str, str],
+                           categories: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        return {category: repos for category, repos in categories.items() if category not in descriptions}
+    
+    def _sample_repos(self, repos: List[Dict]) -> List[Dict]:
+        """Summarize the first few repositories of a category for AI prompts"""
+        return [
+            {
+                "name": repo.get("name", ""),
+                "description": (repo.get("description") or "")[:SAMPLE_DESCRIPTION_CHARS],
+                "language": repo.get("language") or "",
+                "topics": (repo.get("topics") or [])[:SAMPLE_TOPICS],
+                "stars": repo.get("stargazers_count", 0)
+            }
+            for repo in repos[:SUMMARY_SAMPLE_SIZE]
+        ]
+    
+    def _summary_prompt(self, category: str, repos: List[Dict]) -> str:
+        """Build the prompt describing a single star list"""
+        return _SUMMARY_PROMPT_TEMPLATE.format(
+            category=category,
+            samples=orjson.dumps(self._sample_repos(repos)).decode(),
+            count=len(repos)
+        )
+    
+    def _batch_summary_prompt(self, categories: Dict[str, List[Dict]]) -> str:
+        """Build one prompt describing several star lists"""
+        payload = [
+            {"category": category, "sample_repos": self._sample_repos(repos), "total_count": len(repos)}
+            for category, repos in categories.items()
+        ]
+        return _BATCH_SUMMARY_PROMPT_TEMPLATE.format(lists=orjson.dumps(payload).decode())
+    
+    def _parse_batch_summaries(self, response: str, categories: Dict[str, List[Dict]]) -> Dict[str, str]:
+        """Return the valid descriptions from a batched summary response, caching each
+        
+        Code fences are stripped first, since replies are not always in JSON
+        mode (see call_llm_with_config).
+        """
+        data = orjson.loads(strip_code_fence(response))
+        descriptions = data.get("descriptions") if isinstance(data, dict) else None
+        if not isinstance(descriptions, dict):
+            raise ValueError("Batch summary response has no 'descriptions' object")
+        return {
+            category: self._store_description(self._summary_cache_key(category, categories[category]),
+                                              description.strip(), category, categories[category])
+            for category, description in descriptions.items()
+            if category in categories and isinstance(description, str) and description.strip()
+        }
+    
+    def _llm_concurrency(self) -> int:
+        """Maximum number of summary LLM calls in flight"""
+        return self.config.get("llm_concurrency") or 8
+    
+    def _cache_model(self) -> str:
+        """Model name that is part of every description cache key"""
+        return self.config.get("ai_model") or get_env("AI_MODEL", "gpt-4o-mini")
+    
+    def _summary_cache_key(self, category: str, repos: List[Dict]) -> Optional[str]:
+        """Cache key of a new description: the category and its repository set"""
+        if not self.cache:
+            return None
+        inputs = {"repo_ids": self._repo_set_key(repos), "version": SUMMARY_PROMPT_VERSION}
+        return make_description_key("summary", category, inputs, self._cache_model())
+    
+    def _enhance_cache_key(self, existing_desc: str, category: str, repos: List[Dict]) -> Optional[str]:
+        """Cache key of an enhanced description: the current text and the prompt's stats
         
+        Only the fields the enhance prompt shows are keyed, with total_stars
+        rounded to two significant digits, so star counts drifting between runs
+        do not trigger another enhancement call.
+        """
+        if not self.cache:
+            return None
+        stats = self._enhance_stats(repos)
+        stats["total_stars"] = int(float(f"{stats['total_stars']:.2g}"))
+        inputs = {"description": existing_desc, "count": len(repos), "stats": stats,
+                  "version": SUMMARY_PROMPT_VERSION}
+        return make_description_key("enhance", category, inputs, self._cache_model())
+    
+    def _cached_description(self, cache_key: Optional[str]) -> Optional[str]:
+        """Return the cached description for cache_key, or None on miss"""
+        cached = self.cache.get(cache_key) if cache_key else None
+        return cached.get("description") if cached else None
+    
+    def _store_description(self, cache_key: Optional[str], description: str,
+                           category: str, repos: List[Dict]) -> str:
+        """Cache a non-empty AI description and return it
+        
+        The description is also recorded as already enhanced for these stats,
+        so once it is on the list the next run skips the enhancement call
+        until the repositories change.
+        """
+        if cache_key and description:
+            self.cache.set_many({
+                cache_key: {"description": description},
+                self._enhance_cache_key(description, category, repos): {"description": description},
+            })
+        return description
+    
+    def _split_cached_summaries(self, categories: Dict[str, List[Dict]]) -> Tuple[Dict[str, str], Dict[str, List[Dict]]]:
+        """Split categories into (cached descriptions, categories still to generate)"""
+        if not self.cache or not self.summary_options.get("use_ai_summary", True):
+            return {}, categories
+        
+        cached, pending = {}, {}
+        for category, repos in categories.items():
+            description = self._cached_description(self._summary_cache_key(category, repos))
+            if description:
+                cached[category] = description
+            else:
+                pending[category] = repos
+        return cached, pending
+    
+    def _enhance_stats(self, repos: List[Dict]) -> Dict:
+        """Repository stats shown in the enhance prompt"""
         stats = self._get_repository_stats(repos)
+        # Only the top signals; the full language/topic tallies would bloat the prompt
+        return {key: stats[key] for key in ("total_stars", "top_languages", "top_topics")}
+    
+    def _enhance_prompt(self, existing_desc: str, category: str, repos: List[Dict]) -> str:
+        """Build the prompt enhancing an existing list description"""
+        return _ENHANCE_PROMPT_TEMPLATE.format(
+            existing_desc=existing_desc,
+            category=category,
+            count=len(repos),
+            stats=orjson.dumps(self._enhance_stats(repos)).decode()
+        )
+    
+    def _enhance_lookup(self, existing_desc: str, category: str,
+                        repos: List[Dict]) -> Tuple[Optional[str], Optional[str]]:
+        """Return (description, cache_key); description is None only when an AI call is needed"""
+        if not self.summary_options.get("use_ai_summary", True):
+            return existing_desc, None
+        cache_key = self._enhance_cache_key(existing_desc, category, repos)
+        return self._cached_description(cache_key), cache_key
+    
+    def _enhance_existing_description(self, existing_desc: str, category: str, repos: List[Dict]) -> str:
+        """Enhance existing description with updated information"""
+        description, cache_key = self._enhance_lookup(existing_desc, category, repos)
+        if description:
+            return description
         
-        prompt = f"""
-Enhance this existing GitHub star list description with updated information:
-
-Current description: "{existing_desc}"
-Category: {category}
-Repository count: {len(repos)}
-Repository statistics: {stats}
-
-Enhance the description by:
-1. Keeping the original tone and style
-2. Adding relevant statistics if missing
-3. Updating outdated information
-4. Ensuring accuracy and completeness
-5. Keeping it concise and professional
-
-Enhanced description:"""
+        try:
+            enhanced = call_llm_with_config(self._enhance_prompt(existing_desc, category, repos), self.config)
+            return self._store_description(cache_key, enhanced.strip(), category, repos)
+        except Exception as e:
+            logging.warning(f"Failed to enhance description for {category}: {e}")
+            return existing_desc
+    
+    async def _aenhance_existing_description(self, existing_desc: str, category: str,
+                                             repos: List[Dict]) -> str:
+        """Async version of _enhance_existing_description"""
+        description, cache_key = self._enhance_lookup(existing_desc, category, repos)
+        if description:
+            return description
         
         try:
-            enhanced = call_llm_with_config(prompt, self.config)
-            return enhanced.strip()
+            enhanced = await acall_llm_with_config(self._enhance_prompt(existing_desc, category, repos), self.config)
+            return self._store_description(cache_key, enhanced.strip(), category, repos)
         except Exception as e:
             logging.warning(f"Failed to enhance description for {category}: {e}")
             return existing_desc
     
+    @staticmethod
+    def _repo_set_key(repos: List[Dict]) -> Tuple:
+        """Fingerprint a repository set by its sorted ids"""
+        return tuple(sorted(repo["id"] for repo in repos))
+    
     def _get_repository_stats(self, repos: List[Dict]) -> Dict:
-        """Get statistics about repositories"""
-        stats = {
+        """Get statistics about repositories, computed once per repository set"""
+        key = self._repo_set_key(repos)
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            stats = self._stats_cache[key] = self._compute_repository_stats(repos)
+        return stats
+    
+    def _compute_repository_stats(self, repos: List[Dict]) -> Dict:
+        languages = Counter(repo["language"] for repo in repos if repo.get("language"))
+        topics = Counter(topic for repo in repos for topic in repo.get("topics") or ())
+        
+        return {
             "count": len(repos),
-            "languages": {},
-            "total_stars": 0,
-            "topics": {}
+            "languages": dict(languages),
+            "total_stars": sum(repo.get("stargazers_count", 0) for repo in repos),
+            "topics": dict(topics),
+            # most_common(k) selects with a heap instead of sorting every entry
+            "top_languages": languages.most_common(3),
+            "top_topics": topics.most_common(5)
         }
-        
-        for repo in repos:
-            # Language statistics
-            lang = repo.get("language")
-            if lang:
-                stats["languages"][lang] = stats["languages"].get(lang, 0) + 1
-            
-            # Star count
-            stars = repo.get("stargazers_count", 0)
-            stats["total_stars"] += stars
-            
-            # Topic statistics
-            topics = repo.get("topics", [])
-            for topic in topics:
-                stats["topics"][topic] = stats["topics"].get(topic, 0) + 1
-        
-        # Get top languages and topics
-        stats["top_languages"] = sorted(stats["languages"].items(), key=lambda x: x[1], reverse=True)[:3]
-        stats["top_topics"] = sorted(stats["topics"].items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        return stats
     
     def _generate_basic_description(self, category: str, repos: List[Dict]) -> str:
-        """Generate basic description without AI"""
-        repo_count = len(repos)
-        
-        # Analyze main programming languages
-        languages = {}
-        for repo in repos:
-            lang = repo.get("language")
-            if lang:
-                languages[lang] = languages.get(lang, 0) + 1
+        """Generate basic description without AI, memoized per (category, repository set)
         
-        top_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)[:3]
-        lang_text = ", ".join([lang for lang, _ in top_languages])
+        Builds on the memoized _get_repository_stats result instead of walking
+        the repositories again.
+        """
+        key = (category, self._repo_set_key(repos), self.summary_options.get("include_stats", True))
+        description = self._basic_description_cache.get(key)
+        if description is None:
+            stats = self._get_repository_stats(repos)
+            description = self._basic_description_cache[key] = self._build_basic_description(category, stats)
+        return description
+    
+    def _build_basic_description(self, category: str, stats: Dict) -> str:
+        lang_text = ", ".join([lang for lang, _ in stats["top_languages"]])
         
-        description = f"Auto-categorized {category} repositories ({repo_count} repos)"
+        description = f"Auto-categorized {category} repositories ({stats['count']} repos)"
         if lang_text:
             description += f" - Main languages: {lang_text}"
         
-        if self.summary_options.get("include_stats", True):
-            total_stars = sum(repo.get("stargazers_count", 0) for repo in repos)
-            if total_stars > 0:
-                description += f" - Total stars: {total_stars:,}"
+        if self.summary_options.get("include_stats", True) and stats["total_stars"] > 0:
+            description += f" - Total stars: {stats['total_stars']:,}"
         
         return description
 